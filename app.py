@@ -1,34 +1,82 @@
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-import sqlite3, json, io, csv
+import sqlite3, json, io, csv, os, time, zlib, tempfile, zipfile
+# import of the analysis modules through warm-up is reported as the 'startup' stage in /api/metrics
+BOOT = time.perf_counter()
 from werkzeug.security import generate_password_hash, check_password_hash
-from backend_text_analysis import TextAnalyzer
+from backend_text_analysis import get_analyzer
+from backend_worker_pool import warm_pool
+from backend_search import ensure_fts, fts_search, ensure_keyword_index, index_keywords, top_keywords, related_keywords, keyword_records, keyword_trend
+from backend_db import pool_for, WriteQueue
+from backend_jobs import JobManager, TERMINAL
+from backend_cache import ResultCache
+from backend_metrics import Profiler, metrics
+from backend_ingest import list_sources, analyze_sources, merge_reports
+from backend_datasets import DatasetRegistry
 
 app = Flask(__name__)
 CORS(app, resources={r"/api/*": {"origins": "*"}})
 DATABASE_PATH = 'users.db'
+PARALLEL_WORKERS = int(os.environ.get('PARALLEL_WORKERS', os.cpu_count() or 1))
+PERSIST_ROWS = int(os.environ.get('PERSIST_ROWS', 50))
+PERSIST_ASYNC = os.environ.get('PERSIST_ASYNC', '0') == '1'
+WARM_UP = os.environ.get('WARM_UP', '1') == '1'
+JOB_WORKERS = int(os.environ.get('JOB_WORKERS', 2))
+CACHE_TTL = int(os.environ.get('CACHE_TTL', 7 * 24 * 3600))
+write_queue = WriteQueue()
+# server-side directories/archives are only readable below this root; unset disables path ingestion
+INGEST_ROOT = os.environ.get('INGEST_ROOT')
+PAGE_LIMIT, MAX_PAGE_LIMIT = 50, 500
+# listing projection per table; report_data (and stage_timings) are fetched per row by id
+SUMMARY_COLUMNS = {
+    'activity_history': ('filename', 'operations', 'status', 'records_count', 'processing_time'),
+    'inbox': ('title', 'message', 'type'),
+}
 
-def get_db():
-    conn = sqlite3.connect(DATABASE_PATH)
-    conn.row_factory = sqlite3.Row
-    return conn
+def get_db(write=False):
+    # Pooled WAL connection; writers take the pool's lock so readers never queue behind an analysis commit
+    return pool_for(DATABASE_PATH).connection(write)
 
 def init_db():
-    with get_db() as db:
+    with get_db(write=True) as db:
         db.execute('CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, email TEXT UNIQUE, password TEXT)')
         db.execute('CREATE TABLE IF NOT EXISTS processed_history (id INTEGER PRIMARY KEY AUTOINCREMENT, content TEXT, score REAL, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
-        db.execute('CREATE INDEX IF NOT EXISTS idx_content ON processed_history(content)')
+        # LIKE '%q%' can't use a B-tree, so search goes through an FTS5 mirror instead
+        db.execute('DROP INDEX IF EXISTS idx_content')
+        ensure_fts(db, 'processed_history', 'content')
+        # per-record keyword frequencies, so keyword analytics are aggregate SQL instead of rescans of content
+        ensure_keyword_index(db, 'processed_history', get_analyzer().record_keywords)
         db.execute('CREATE TABLE IF NOT EXISTS inbox (id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, message TEXT, type TEXT, report_data TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
-        db.execute('CREATE TABLE IF NOT EXISTS activity_history (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT, operations TEXT, status TEXT, records_count INTEGER, processing_time REAL, report_data TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
+        # covering indexes for the (timestamp, id) keyset pages: summary listings never touch the report_data blobs
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_inbox_page ON inbox(timestamp, id, {', '.join(SUMMARY_COLUMNS['inbox'])})")
+        db.execute('CREATE TABLE IF NOT EXISTS activity_history (id INTEGER PRIMARY KEY AUTOINCREMENT, filename TEXT, operations TEXT, status TEXT, records_count INTEGER, processing_time REAL, report_data TEXT, stage_timings TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
+        if 'stage_timings' not in [r['name'] for r in db.execute('PRAGMA table_info(activity_history)')]:
+            db.execute('ALTER TABLE activity_history ADD COLUMN stage_timings TEXT')
+        db.execute(f"CREATE INDEX IF NOT EXISTS idx_activity_history_page ON activity_history(timestamp, id, {', '.join(SUMMARY_COLUMNS['activity_history'])})")
+        # Same batch_results layout as text_storage.db, plus the final report
+        db.execute('CREATE TABLE IF NOT EXISTS batch_results (id INTEGER PRIMARY KEY AUTOINCREMENT, batch_id TEXT, filename TEXT, total_records INTEGER, processed_records INTEGER, failed_records INTEGER, start_time DATETIME, end_time DATETIME, status TEXT, report_data TEXT)')
+        db.execute('CREATE UNIQUE INDEX IF NOT EXISTS idx_batch_id ON batch_results(batch_id)')
+        # jobs run on this process's threads, so any still queued or running at boot died with the previous process
+        db.execute("UPDATE batch_results SET status = 'failed', end_time = CURRENT_TIMESTAMP WHERE status IN ('queued', 'running')")
+        db.execute('CREATE TABLE IF NOT EXISTS result_cache (key TEXT PRIMARY KEY, payload TEXT, created REAL, last_used REAL)')
+        db.execute('CREATE INDEX IF NOT EXISTS idx_result_cache_lru ON result_cache(last_used)')
+        # running aggregates per appended dataset (backend_datasets); version guards concurrent appends
+        db.execute('CREATE TABLE IF NOT EXISTS datasets (name TEXT PRIMARY KEY, state TEXT, records INTEGER, rule_version TEXT, version INTEGER, updated REAL)')
         db.execute('CREATE TABLE IF NOT EXISTS contact_messages (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, email TEXT, message TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
 init_db()
+# Compile the rules, load langdetect's profiles and prime the caches before the pool forks, so workers inherit them and no request pays for them
+if WARM_UP: get_analyzer().warm_up()
+metrics.observe('startup', time.perf_counter() - BOOT)
+# Fork the analysis workers now, before the server starts its threads: /api/ingest always runs on the pool, so it's warmed even with
+# one worker, and no request ever forks from a server thread
+warm_pool(max(PARALLEL_WORKERS, 1))
 
 @app.route("/api/signup", methods=["POST"])
 def signup():
     data = request.json
     pw = generate_password_hash(data.get("password"))
     try:
-        with get_db() as db:
+        with get_db(write=True) as db:
             db.execute("INSERT INTO users (name, email, password) VALUES (?, ?, ?)", (data.get("full_name"), data.get("email"), pw))
             db.commit()
         return jsonify({"message": "Success"}), 201
@@ -47,60 +95,323 @@ def login():
 def reset_password():
     data = request.json
     new_pw = generate_password_hash(data.get("new_password"))
-    with get_db() as db:
+    with get_db(write=True) as db:
         db.execute("UPDATE users SET password = ? WHERE email = ?", (new_pw, data.get("email")))
         db.commit()
     return jsonify({"message": "Updated"}), 200
 
+def row_json(row):
+    # Compact, searchable JSON; NaN isn't valid JSON so it's stored as null
+    return json.dumps({k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}, ensure_ascii=False, separators=(',', ':'), default=str)
+
+def persist_analysis(filename, operations, results, stats, rows, scores, notify=True):
+    history = [(row_json(row), score) for row, score in zip(rows, scores)]
+    report_json = json.dumps(results)
+    with get_db(write=True) as db:
+        db.executemany("INSERT INTO processed_history (content, score) VALUES (?, ?)", history)
+        # ids are AUTOINCREMENT under the write lock, so this batch holds the len(history) ids ending at last_insert_rowid()
+        last = db.execute("SELECT last_insert_rowid()").fetchone()[0]
+        index_keywords(db, zip(range(last - len(history) + 1, last + 1), map(get_analyzer().record_keywords, rows)))
+        if notify: db.execute("INSERT INTO inbox (title, message, type, report_data) VALUES (?, ?, ?, ?)", 
+                   ("Analysis Task Completed", f"Successfully processed {stats['total_records']} records.", "success", report_json))
+        db.execute('''INSERT INTO activity_history (filename, operations, status, records_count, processing_time, report_data, stage_timings) 
+                     VALUES (?, ?, ?, ?, ?, ?, ?)''', (filename, ", ".join(operations), "Completed", stats['total_records'], stats['processing_time'], report_json,
+                                                 json.dumps(stats.get('stages', []))))
+
+def persist_timed(*job):
+    # off-request persistence can't land in the response's stages, so it only feeds the 'persist' histogram
+    t0 = time.perf_counter()
+    persist_analysis(*job)
+    metrics.observe('persist', time.perf_counter() - t0)
+
+result_cache = ResultCache(get_db, ttl=CACHE_TTL)
+
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     data = request.json
-    analyzer = TextAnalyzer()
-    results, raw_rows, stats, scores = analyzer.run_pipeline(data.get('text', ''), data.get('operations', []))
-    if raw_rows:
-        with get_db() as db:
-            for idx, row in enumerate(raw_rows[:50]):
-                db.execute("INSERT INTO processed_history (content, score) VALUES (?, ?)", (str(row), scores[idx]))
-            report_json = json.dumps(results)
-            db.execute("INSERT INTO inbox (title, message, type, report_data) VALUES (?, ?, ?, ?)", 
-                       ("Analysis Task Completed", f"Successfully processed {len(raw_rows)} records.", "success", report_json))
-            db.execute('''INSERT INTO activity_history (filename, operations, status, records_count, processing_time, report_data) 
-                         VALUES (?, ?, ?, ?, ?, ?)''', (data.get('filename', 'Bulk_Data.csv'), ", ".join(data.get('operations', [])), "Completed", len(raw_rows), stats['processing_time'], report_json))
-            db.commit()
+    analyzer = get_analyzer()
+    text, operations, filename = data.get('text', ''), data.get('operations', []), data.get('filename', 'Bulk_Data.csv')
+    start = time.time()
+    # 'profile': true additionally captures cProfile and tracemalloc output for this request
+    profiler = Profiler(capture=bool(data.get('profile'))).start()
+    try:
+        with profiler.span('cache_lookup'):
+            key = result_cache.key(text, operations, analyzer.rule_version())
+            cached = result_cache.get(key)
+        if cached is not None:
+            # same input, operations and rules: replay the stored report in the requested order, nothing to re-score or re-store
+            by_title = {r['title']: r for r in cached['results']}
+            results = [by_title[op] for op in operations]
+            stats = dict(cached['stats'], cached=True, processing_time=time.time() - start)
+            rows, scores = [], []
+        else:
+            results, raw_rows, stats, scores = analyzer.run_pipeline(text, operations, stream=data.get('stream', False), parallel=data.get('parallel', False), profiler=profiler, keep_rows=PERSIST_ROWS)
+            rows, scores = (raw_rows[:PERSIST_ROWS], scores[:PERSIST_ROWS].tolist()) if raw_rows else (None, None)
+            # a report scored on untranslated text is served once but not replayed; the next request retries the translation
+            if raw_rows and not stats.get('translation_incomplete'): result_cache.put(key, {"results": results, "stats": stats})
+        if rows is not None:
+            job = (filename, operations, results, dict(stats, stages=profiler.report()), rows, scores)
+            if PERSIST_ASYNC: write_queue.submit(persist_timed, *job)
+            else:
+                with profiler.span('persist', len(rows)): persist_analysis(*job)
+    finally:
+        capture = profiler.finish()
+    if stats is not None:
+        stats = dict(stats, stages=profiler.report())
+        if capture: stats['profile'] = capture
     return jsonify({"results": results, "stats": stats})
 
+def persist_ingest(files, operations, results, stats):
+    # one history entry per file, one inbox message for the whole upload
+    for f in files:
+        if f['ok']: persist_analysis(f['filename'], operations, f['results'], f['stats'], f['rows'], f['scores'], notify=False)
+    with get_db(write=True) as db:
+        db.execute("INSERT INTO inbox (title, message, type, report_data) VALUES (?, ?, ?, ?)",
+                   ("Ingestion Completed", f"Processed {stats['total_records']} records from {stats['files'] - stats['failed_files']} of {stats['files']} files.",
+                    "success" if not stats['failed_files'] else "warning", json.dumps(results)))
+
+def ingest_path(path):
+    if not INGEST_ROOT: return None, (jsonify({"error": "Path ingestion is disabled"}), 403)
+    root, real = os.path.realpath(INGEST_ROOT), os.path.realpath(path)
+    if os.path.commonpath([root, real]) != root or not os.path.exists(real): return None, (jsonify({"error": "Path not found"}), 404)
+    return real, None
+
+@app.route('/api/ingest', methods=['POST'])
+def ingest():
+    # a multipart 'archive' (ZIP) upload, or JSON {"path": ...} naming a directory or ZIP under INGEST_ROOT; each CSV becomes one pool task
+    start = time.time()
+    upload, tmp = request.files.get('archive'), None
+    if upload:
+        try: operations = json.loads(request.form.get('operations', '[]'))
+        except ValueError: return jsonify({"error": "operations must be a JSON list"}), 400
+    else:
+        data = request.json or {}
+        operations = data.get('operations', [])
+        path, error = ingest_path(data.get('path', ''))
+        if error: return error
+    if not isinstance(operations, list) or not all(isinstance(op, str) for op in operations):
+        return jsonify({"error": "operations must be a JSON list"}), 400
+    if upload:
+        # spooled to disk so members stream from the file instead of the whole archive sitting in memory
+        with tempfile.NamedTemporaryFile(suffix='.zip', delete=False) as f: upload.save(f); tmp = path = f.name
+    try:
+        try: sources = list_sources(path)
+        except zipfile.BadZipFile: return jsonify({"error": "Not a ZIP archive"}), 400
+        if not sources: return jsonify({"error": "No CSV files found"}), 400
+        files = analyze_sources(sources, operations, PERSIST_ROWS)
+    finally:
+        if tmp: os.unlink(tmp)
+    results, stats = merge_reports(files, operations, time.time() - start)
+    if PERSIST_ASYNC: write_queue.submit(persist_ingest, files, operations, results, stats)
+    else: persist_ingest(files, operations, results, stats)
+    per_file = [{"filename": f['filename'], "ok": f['ok'], "total_records": f['stats']['total_records'],
+                 "avg_score": f['stats'].get('avg_score'), "processing_time": f['stats']['processing_time']} for f in files]
+    return jsonify({"results": results, "stats": dict(stats, per_file=per_file)})
+
+datasets = DatasetRegistry(get_db)
+
+@app.route('/api/datasets', methods=['GET'])
+def list_datasets():
+    return jsonify(datasets.list())
+
+@app.route('/api/datasets/<name>', methods=['DELETE'])
+def delete_dataset(name):
+    if not datasets.delete(name): return jsonify({"error": "Not found"}), 404
+    return jsonify({"message": "Deleted"})
+
+@app.route('/api/datasets/<name>/append', methods=['POST'])
+def append_dataset(name):
+    # only the posted rows are parsed; the report covers every row the dataset has received. 'reset': true starts it over.
+    data = request.json
+    analyzer = get_analyzer()
+    text, operations = data.get('text', ''), data.get('operations', [])
+    profiler = Profiler().start()
+    try:
+        with datasets.lock(name):
+            with profiler.span('load'): state, version, rule_version = datasets.load(name)
+            if data.get('reset') or state is None: state = {}
+            elif rule_version != analyzer.rule_version():
+                return jsonify({"error": "Rules changed since this dataset was built; append again with reset"}), 409
+            results, raw_rows, stats, scores = analyzer.run_pipeline(text, operations, profiler=profiler, state=state, keep_rows=PERSIST_ROWS)
+            if raw_rows is None: return jsonify({"results": results, "stats": None})
+            with profiler.span('save'):
+                if not datasets.save(name, state, version, analyzer.rule_version()):
+                    return jsonify({"error": "Dataset was updated concurrently; retry"}), 409
+        job = (name, operations, results, dict(stats, stages=profiler.report()), raw_rows[:PERSIST_ROWS], scores[:PERSIST_ROWS].tolist())
+        if PERSIST_ASYNC: write_queue.submit(persist_timed, *job)
+        else:
+            with profiler.span('persist', len(job[4])): persist_analysis(*job)
+    finally:
+        profiler.finish()
+    return jsonify({"results": results, "stats": dict(stats, stages=profiler.report())})
+
+@app.route('/api/cache/stats', methods=['GET'])
+def cache_stats():
+    return jsonify(result_cache.stats())
+
+@app.route('/api/metrics', methods=['GET'])
+def get_metrics():
+    # p50/p95/p99 over the recent window and cumulative histogram buckets, per stage (seconds)
+    return jsonify(metrics.snapshot())
+
+jobs = JobManager(get_db, get_analyzer, workers=JOB_WORKERS, keep_rows=PERSIST_ROWS,
+                  on_complete=lambda filename, ops, results, stats, rows, scores: persist_timed(filename, ops, results, stats, rows[:PERSIST_ROWS], scores[:PERSIST_ROWS].tolist()))
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    data = request.json
+    batch_id = jobs.submit(data.get('text', ''), data.get('operations', []), data.get('filename', 'Bulk_Data.csv'))
+    return jsonify({"batch_id": batch_id, "status": "queued"}), 202
+
+@app.route('/api/jobs/<batch_id>', methods=['GET'])
+def job_status(batch_id):
+    job = jobs.status(batch_id)
+    if job is None: return jsonify({"message": "Not found"}), 404
+    return jsonify(job)
+
+@app.route('/api/jobs/<batch_id>/stream', methods=['GET'])
+def job_stream(batch_id):
+    # NDJSON: one line per progress change, each with the latest partial report while running; the last one carries the final report
+    def events():
+        last = None
+        while True:
+            job = jobs.status(batch_id)
+            if job is None: return
+            if job['status'] in TERMINAL:
+                yield json.dumps(job) + "\n"
+                return
+            if (job['status'], job['processed_records']) != last:
+                last = (job['status'], job['processed_records'])
+                yield json.dumps(job) + "\n"
+            time.sleep(0.5)
+    if jobs.status(batch_id) is None: return jsonify({"message": "Not found"}), 404
+    return Response(events(), mimetype='application/x-ndjson')
+
+@app.route('/api/jobs/<batch_id>/cancel', methods=['POST'])
+def cancel_job(batch_id):
+    if not jobs.cancel(batch_id): return jsonify({"message": "Not running"}), 409
+    return jsonify({"message": "Cancelling"}), 202
+
 @app.route('/api/search', methods=['GET'])
 def search():
-    q = request.args.get('q', '')
+    args = request.args
+    try:
+        with get_db() as db:
+            rows, next_cursor = fts_search(db, 'processed_history', args.get('q', ''), args.get('mode', 'prefix'), args.get('sort', 'recent'),
+                                           args.get('cursor'), min(args.get('limit', 10, type=int), 100))
+    except (sqlite3.OperationalError, ValueError, IndexError):
+        return jsonify({"message": "Invalid search query"}), 400
+    resp = jsonify(rows)
+    if next_cursor: resp.headers['X-Next-Cursor'] = next_cursor
+    return resp
+
+def keyword_limit(default=20):
+    return min(max(request.args.get('limit', default, type=int), 1), MAX_PAGE_LIMIT)
+
+@app.route('/api/keywords', methods=['GET'])
+def get_keywords():
+    with get_db() as db: return jsonify(top_keywords(db, 'processed_history', keyword_limit(), request.args.get('since')))
+
+@app.route('/api/keywords/trend', methods=['GET'])
+def get_keyword_trend():
+    keywords = [k.lower() for k in request.args.getlist('k') if k]
+    bucket = request.args.get('bucket', 'day')
+    if not keywords or bucket not in ('day', 'month'): return jsonify({"message": "Pass one or more k= keywords and bucket=day|month"}), 400
+    with get_db() as db: return jsonify(keyword_trend(db, 'processed_history', keywords, bucket))
+
+@app.route('/api/keywords/<keyword>/related', methods=['GET'])
+def get_related_keywords(keyword):
+    with get_db() as db: return jsonify(related_keywords(db, keyword.lower(), keyword_limit()))
+
+@app.route('/api/keywords/<keyword>/records', methods=['GET'])
+def get_keyword_records(keyword):
+    try:
+        with get_db() as db: rows, next_cursor = keyword_records(db, 'processed_history', keyword.lower(), request.args.get('cursor'), keyword_limit(10))
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
+    resp = jsonify(rows)
+    if next_cursor: resp.headers['X-Next-Cursor'] = next_cursor
+    return resp
+
+def page_query(table, args):
+    # newest first, keyset on (timestamp, id); cursor is "<timestamp>:<id>" of the last row already seen
+    cols = '*' if args.get('fields') == 'full' else ', '.join(('id', 'timestamp') + SUMMARY_COLUMNS[table])
+    sql, params = f"SELECT {cols} FROM {table}", []
+    cursor = args.get('cursor')
+    if cursor:
+        ts, _, last_id = cursor.rpartition(':')
+        sql += " WHERE (timestamp, id) < (?, ?)"
+        params += [ts, int(last_id)]
+    return sql + " ORDER BY timestamp DESC, id DESC", params
+
+def list_page(table):
+    args = request.args
+    try:
+        sql, params = page_query(table, args)
+        limit = min(max(args.get('limit', PAGE_LIMIT, type=int), 1), MAX_PAGE_LIMIT)
+    except ValueError:
+        return jsonify({"message": "Invalid cursor"}), 400
+    if args.get('format') == 'ndjson': return export_ndjson(sql, params)
+    with get_db() as db:
+        rows = [dict(r) for r in db.execute(sql + " LIMIT ?", params + [limit + 1]).fetchall()]
+    resp = jsonify(rows[:limit])
+    if len(rows) > limit: resp.headers['X-Next-Cursor'] = f"{rows[limit - 1]['timestamp']}:{rows[limit - 1]['id']}"
+    return resp
+
+def export_ndjson(sql, params, batch=500):
+    # bulk export: one JSON object per line, read in batches and gzipped on the fly when the client accepts it
+    gzip = 'gzip' in request.headers.get('Accept-Encoding', '')
+    def lines():
+        with get_db() as db:
+            cur = db.execute(sql, params)
+            while True:
+                rows = cur.fetchmany(batch)
+                if not rows: return
+                yield ''.join(json.dumps(dict(r), default=str) + "\n" for r in rows).encode()
+    def gzipped():
+        z = zlib.compressobj(6, zlib.DEFLATED, 31)
+        for chunk in lines(): yield z.compress(chunk)
+        yield z.flush()
+    resp = Response(gzipped() if gzip else lines(), mimetype='application/x-ndjson')
+    if gzip: resp.headers['Content-Encoding'] = 'gzip'
+    return resp
+
+def get_one(table, row_id):
     with get_db() as db:
-        rows = db.execute("SELECT * FROM processed_history WHERE content LIKE ? ORDER BY timestamp DESC LIMIT 10", (f'%{q}%',)).fetchall()
-    return jsonify([dict(r) for r in rows])
+        row = db.execute(f"SELECT * FROM {table} WHERE id = ?", (row_id,)).fetchone()
+    if row is None: return jsonify({"message": "Not found"}), 404
+    return jsonify(dict(row))
 
 @app.route('/api/history', methods=['GET'])
 def get_history():
-    with get_db() as db:
-        rows = db.execute("SELECT * FROM activity_history ORDER BY timestamp DESC").fetchall()
-    return jsonify([dict(r) for r in rows])
+    return list_page('activity_history')
+
+@app.route('/api/history/<int:row_id>', methods=['GET'])
+def get_history_item(row_id):
+    return get_one('activity_history', row_id)
 
 @app.route('/api/inbox', methods=['GET'])
 def get_inbox():
-    with get_db() as db:
-        rows = db.execute("SELECT * FROM inbox ORDER BY timestamp DESC").fetchall()
-    return jsonify([dict(r) for r in rows])
+    return list_page('inbox')
+
+@app.route('/api/inbox/<int:row_id>', methods=['GET'])
+def get_inbox_item(row_id):
+    return get_one('inbox', row_id)
 
 @app.route('/api/cleanup', methods=['POST'])
 def cleanup():
-    with get_db() as db:
+    with get_db(write=True) as db:
         db.execute("DELETE FROM processed_history")
         db.execute("DELETE FROM activity_history")
         db.execute("DELETE FROM inbox")
         db.commit()
+    result_cache.clear()
     return jsonify({"message": "Cleaned"}), 200
 
 @app.route('/api/contact', methods=['POST'])
 def contact():
     data = request.json
-    with get_db() as db:
+    with get_db(write=True) as db:
         db.execute("INSERT INTO contact_messages (name, email, message) VALUES (?, ?, ?)", (data.get('name'), data.get('email'), data.get('message')))
         db.commit()
     return jsonify({"message": "Sent"}), 200
@@ -0,0 +1,67 @@
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+
+class ResultCache:
+    """Two-tier (in-memory LRU + SQLite) cache of pipeline results keyed by input, operations and rule version."""
+
+    def __init__(self, get_db, memory_entries=128, max_entries=10000, ttl=7 * 24 * 3600):
+        self.get_db, self.memory_entries, self.max_entries, self.ttl = get_db, memory_entries, max_entries, ttl
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.counters = {'hits': 0, 'memory_hits': 0, 'disk_hits': 0, 'misses': 0}
+
+    @staticmethod
+    def key(text, operations, version):
+        h = hashlib.sha256(version.encode())
+        h.update(json.dumps(sorted(set(operations))).encode())
+        h.update(text.strip().replace('\r\n', '\n').encode('utf-8', 'surrogatepass'))
+        return h.hexdigest()
+
+    def _remember(self, key, value):
+        with self.lock:
+            self.memory[key] = value
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_entries: self.memory.popitem(last=False)
+
+    def get(self, key):
+        now = time.time()
+        with self.lock:
+            hit = self.memory.get(key)
+            if hit is not None and now - hit[0] < self.ttl:
+                self.memory.move_to_end(key)
+                self.counters['hits'] += 1
+                self.counters['memory_hits'] += 1
+                return hit[1]
+        with self.get_db() as db:
+            row = db.execute("SELECT payload, created FROM result_cache WHERE key = ?", (key,)).fetchone()
+        if row is None or now - row['created'] >= self.ttl:
+            with self.lock: self.counters['misses'] += 1
+            return None
+        with self.get_db(write=True) as db:
+            db.execute("UPDATE result_cache SET last_used = ? WHERE key = ?", (now, key))
+        value = json.loads(row['payload'])
+        self._remember(key, (row['created'], value))
+        with self.lock:
+            self.counters['hits'] += 1
+            self.counters['disk_hits'] += 1
+        return value
+
+    def put(self, key, value):
+        now = time.time()
+        self._remember(key, (now, value))
+        with self.get_db(write=True) as db:
+            db.execute("INSERT OR REPLACE INTO result_cache (key, payload, created, last_used) VALUES (?, ?, ?, ?)", (key, json.dumps(value), now, now))
+            db.execute("DELETE FROM result_cache WHERE created < ?", (now - self.ttl,))
+            db.execute("DELETE FROM result_cache WHERE key IN (SELECT key FROM result_cache ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+
+    def clear(self):
+        with self.lock: self.memory.clear()
+        with self.get_db(write=True) as db: db.execute("DELETE FROM result_cache")
+
+    def stats(self):
+        with self.lock: out = dict(self.counters, memory_entries=len(self.memory))
+        with self.get_db() as db: out['disk_entries'] = db.execute("SELECT COUNT(*) FROM result_cache").fetchone()[0]
+        return out
@@ -0,0 +1,61 @@
+import json
+import threading
+import time
+from collections import defaultdict
+import numpy as np
+import pandas as pd
+
+def _default(o):
+    if isinstance(o, np.ndarray): return o.tolist()
+    if isinstance(o, np.generic): return o.item()
+    raise TypeError(f'{type(o).__name__} is not JSON serializable')
+
+def encode_state(state):
+    head = state['head']
+    return json.dumps(dict(state, head=head.astype(object).where(head.notna(), None).values.tolist()), default=_default)
+
+def decode_state(payload):
+    state = json.loads(payload)
+    head = pd.DataFrame(state['head'], columns=state['columns'], dtype=object)
+    # missing cells were stored as null; the streaming reader has them as NaN
+    state['head'] = head.where(head.notna(), np.nan)
+    return state
+
+class DatasetRegistry:
+    """Named datasets that grow by appends: each keeps the running aggregates of TextAnalyzer.run_pipeline(state=...) in SQLite,
+    so an append only parses its own rows."""
+
+    def __init__(self, get_db):
+        self.get_db = get_db
+        self.locks = defaultdict(threading.Lock)
+        self.locks_lock = threading.Lock()
+
+    def lock(self, name):
+        # appends to one dataset are serialized in-process; the version check in save() catches other processes
+        with self.locks_lock: return self.locks[name]
+
+    def load(self, name):
+        """(state, version, rule_version), or (None, 0, None) for a dataset that doesn't exist yet."""
+        with self.get_db() as db:
+            row = db.execute("SELECT state, version, rule_version FROM datasets WHERE name = ?", (name,)).fetchone()
+        if row is None: return None, 0, None
+        return decode_state(row['state']), row['version'], row['rule_version']
+
+    def save(self, name, state, version, rule_version):
+        """Stores the merged state if the dataset is still at `version`; returns False when another writer got there first."""
+        payload = encode_state(state)
+        with self.get_db(write=True) as db:
+            if version == 0:
+                cur = db.execute("INSERT OR IGNORE INTO datasets (name, state, records, rule_version, version, updated) VALUES (?, ?, ?, ?, 1, ?)",
+                                 (name, payload, state['total'], rule_version, time.time()))
+            else:
+                cur = db.execute("UPDATE datasets SET state = ?, records = ?, rule_version = ?, version = version + 1, updated = ? WHERE name = ? AND version = ?",
+                                 (payload, state['total'], rule_version, time.time(), name, version))
+        return cur.rowcount == 1
+
+    def list(self):
+        with self.get_db() as db:
+            return [dict(r) for r in db.execute("SELECT name, records, version, updated FROM datasets ORDER BY updated DESC")]
+
+    def delete(self, name):
+        with self.get_db(write=True) as db: return db.execute("DELETE FROM datasets WHERE name = ?", (name,)).rowcount == 1
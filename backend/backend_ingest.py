@@ -0,0 +1,57 @@
+import io
+import os
+import time
+import zipfile
+from contextlib import ExitStack
+from backend_worker_pool import get_pool
+from backend_text_analysis import get_analyzer
+
+def list_sources(path):
+    """(label, path, member) for each CSV in a ZIP or in a directory (including CSVs inside ZIPs there); member is None for plain files."""
+    if os.path.isdir(path):
+        sources = []
+        for name in sorted(os.listdir(path)):
+            full = os.path.join(path, name)
+            if name.lower().endswith('.csv') and os.path.isfile(full): sources.append((name, full, None))
+            elif name.lower().endswith('.zip') and zipfile.is_zipfile(full): sources += [(f'{name}/{label}', p, m) for label, p, m in list_sources(full)]
+        return sources
+    with zipfile.ZipFile(path) as zf:
+        return [(info.filename, path, info.filename) for info in zf.infolist() if not info.is_dir() and info.filename.lower().endswith('.csv')]
+
+def _open(stack, path, member):
+    # members are decompressed as they're read, never extracted to disk
+    raw = stack.enter_context(zipfile.ZipFile(path)).open(member) if member else stack.enter_context(open(path, 'rb'))
+    return io.TextIOWrapper(raw, encoding='utf-8', errors='replace', newline='')
+
+def _analyze_source(label, path, member, operations, keep_rows):
+    # runs in a pool worker: only the report, stats and the rows to persist travel back to the parent
+    start = time.time()
+    try:
+        with ExitStack() as stack:
+            results, rows, stats, scores = get_analyzer().run_pipeline(_open(stack, path, member), operations, stream=True, keep_rows=keep_rows)
+    except Exception as e:
+        results, rows, stats, scores = [{"title": "Error", "output": str(e), "success": False}], None, None, None
+    if rows is None:
+        return {'filename': label, 'ok': False, 'results': results, 'stats': {'total_records': 0, 'processing_time': time.time() - start}}
+    return {'filename': label, 'ok': True, 'results': results, 'stats': stats, 'rows': rows[:keep_rows], 'scores': scores[:keep_rows].tolist()}
+
+def analyze_sources(sources, operations, keep_rows=50):
+    """Fans the sources out across the process pool (one file per task) and returns the per-file reports in source order."""
+    if not sources: return []
+    return list(get_pool().map(_analyze_source, *zip(*[(label, path, member, operations, keep_rows) for label, path, member in sources])))
+
+def merge_reports(files, operations, elapsed):
+    """One combined report: each operation's per-file outputs under a file heading, plus record-weighted totals."""
+    ok = [f for f in files if f['ok']]
+    results = []
+    for op in operations:
+        sections = []
+        for f in files:
+            out = next((r['output'] for r in f['results'] if r['title'] == op), None) if f['ok'] else f['results'][0]['output']
+            if out is not None: sections.append(f"[{f['filename']}]\n{out}")
+        results.append({"title": op, "output": "\n".join(sections), "success": bool(ok)})
+    total = sum(f['stats']['total_records'] for f in ok)
+    avg_score = sum(f['stats']['avg_score'] * f['stats']['total_records'] for f in ok) / total if total else 0
+    stats = {"files": len(files), "failed_files": len(files) - len(ok), "total_records": total, "processing_time": elapsed,
+             "cpu_time": sum(f['stats']['processing_time'] for f in files), "avg_score": avg_score, "alert": avg_score < -0.3}
+    return results, stats
@@ -0,0 +1,105 @@
+import json
+import re
+
+def ensure_fts(conn, table, column):
+    """Mirror table.column into an external-content FTS5 index kept in sync by triggers; backfills on first creation."""
+    fts = f'{table}_fts'
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (fts,)).fetchone()
+    conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5({column}, content='{table}', content_rowid='id')")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ai AFTER INSERT ON {table} BEGIN INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END")
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_fts_ad AFTER DELETE ON {table} BEGIN INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column}); END")
+    conn.execute(f"""CREATE TRIGGER IF NOT EXISTS {table}_fts_au AFTER UPDATE ON {table} BEGIN
+        INSERT INTO {fts}({fts}, rowid, {column}) VALUES ('delete', old.id, old.{column});
+        INSERT INTO {fts}(rowid, {column}) VALUES (new.id, new.{column}); END""")
+    if not exists: conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+def build_query(q, mode='prefix'):
+    # prefix: every word as a prefix term (closest to the old LIKE '%q%'), phrase: exact word sequence, match: raw FTS5 syntax
+    if mode == 'match': return q.strip() or None
+    terms = re.findall(r'\w+', q)
+    if not terms: return None
+    if mode == 'phrase': return '"' + ' '.join(terms) + '"'
+    return ' '.join(f'"{t}"*' for t in terms)
+
+def fts_search(conn, table, q, mode='prefix', sort='recent', cursor=None, limit=10):
+    """Returns (rows, next_cursor). 'recent' pages by id, 'rank' by (bm25 rank, id); an empty query lists the latest rows."""
+    fts, match = f'{table}_fts', build_query(q, mode)
+    if match is None:
+        sql, args = f"SELECT * FROM {table} WHERE id < ? ORDER BY id DESC LIMIT ?", [int(cursor) if cursor else 2 ** 63 - 1, limit + 1]
+    elif sort == 'rank':
+        rank, last_id = (float(cursor.split(':')[0]), int(cursor.split(':')[1])) if cursor else (float('-inf'), 0)
+        sql = f"""SELECT t.*, f.rank AS rank FROM {fts} f JOIN {table} t ON t.id = f.rowid
+                  WHERE {fts} MATCH ? AND (f.rank, f.rowid) > (?, ?) ORDER BY f.rank, f.rowid LIMIT ?"""
+        args = [match, rank, last_id, limit + 1]
+    else:
+        sql = f"""SELECT t.* FROM {fts} f JOIN {table} t ON t.id = f.rowid
+                  WHERE {fts} MATCH ? AND f.rowid < ? ORDER BY f.rowid DESC LIMIT ?"""
+        args = [match, int(cursor) if cursor else 2 ** 63 - 1, limit + 1]
+    cur = conn.execute(sql, args)
+    cols = [d[0] for d in cur.description]
+    rows = [dict(zip(cols, r)) for r in cur.fetchall()]
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = f"{last['rank']!r}:{last['id']}" if match is not None and sort == 'rank' else str(last['id'])
+    return rows, next_cursor
+
+def ensure_keyword_index(conn, table, keywords):
+    """search_index(text_id, keyword, frequency) over table's JSON rows, laid out as in text_storage.db; backfills on first creation.
+
+    keywords maps a decoded row to its keyword Counter; deletes from table cascade through a trigger.
+    """
+    exists = conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'search_index'").fetchone()
+    conn.execute('CREATE TABLE IF NOT EXISTS search_index (id INTEGER PRIMARY KEY AUTOINCREMENT, text_id INTEGER, keyword TEXT, frequency INTEGER)')
+    # covering indexes: keyword aggregates and lookups read only (keyword, text_id, frequency), co-occurrence walks (text_id, keyword)
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_keyword ON search_index(keyword, text_id, frequency)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_keyword_text ON search_index(text_id, keyword)')
+    conn.execute(f"CREATE TRIGGER IF NOT EXISTS {table}_kw_ad AFTER DELETE ON {table} BEGIN DELETE FROM search_index WHERE text_id = old.id; END")
+    if not exists:
+        rows = conn.execute(f"SELECT id, content FROM {table} WHERE content IS NOT NULL").fetchall()
+        index_keywords(conn, ((r[0], keywords(_decode_row(r[1]))) for r in rows))
+
+def _decode_row(content):
+    # rows stored before content became JSON hold str(dict); their raw text is tokenized as a single cell
+    try: row = json.loads(content)
+    except ValueError: return {'content': content}
+    return row if isinstance(row, dict) else {'content': content}
+
+def index_keywords(conn, records):
+    """records: (text_id, Counter) pairs; one batched insert for all of them."""
+    conn.executemany("INSERT INTO search_index (text_id, keyword, frequency) VALUES (?, ?, ?)",
+                     ((text_id, k, n) for text_id, counts in records for k, n in counts.items()))
+
+def top_keywords(conn, table, limit=20, since=None):
+    """Most frequent keywords across the index, with how many records each appears in; since limits to newer records."""
+    if since is None:
+        sql, args = "SELECT keyword, SUM(frequency) AS frequency, COUNT(*) AS records FROM search_index GROUP BY keyword", []
+    else:
+        sql = f"""SELECT s.keyword, SUM(s.frequency) AS frequency, COUNT(*) AS records FROM search_index s JOIN {table} t ON t.id = s.text_id
+                  WHERE t.timestamp >= ? GROUP BY s.keyword"""
+        args = [since]
+    return [dict(r) for r in conn.execute(sql + " ORDER BY frequency DESC, keyword LIMIT ?", args + [limit])]
+
+def related_keywords(conn, keyword, limit=20):
+    """Keywords sharing a record with `keyword`, by number of shared records."""
+    sql = """SELECT b.keyword, COUNT(*) AS records FROM search_index a JOIN search_index b ON b.text_id = a.text_id AND b.keyword != a.keyword
+             WHERE a.keyword = ? GROUP BY b.keyword ORDER BY records DESC, b.keyword LIMIT ?"""
+    return [dict(r) for r in conn.execute(sql, (keyword, limit))]
+
+def keyword_records(conn, table, keyword, cursor=None, limit=10):
+    """Returns (rows, next_cursor): the records containing `keyword`, newest first, paged by id."""
+    sql = f"""SELECT t.*, s.frequency FROM search_index s JOIN {table} t ON t.id = s.text_id
+              WHERE s.keyword = ? AND s.text_id < ? ORDER BY s.text_id DESC LIMIT ?"""
+    rows = [dict(r) for r in conn.execute(sql, (keyword, int(cursor) if cursor else 2 ** 63 - 1, limit + 1))]
+    return rows[:limit], (str(rows[limit - 1]['id']) if len(rows) > limit else None)
+
+def keyword_trend(conn, table, keywords, bucket='day'):
+    """Per keyword, its frequency and record count in each day or month bucket of the records' timestamps."""
+    fmt = {'day': '%Y-%m-%d', 'month': '%Y-%m'}[bucket]
+    marks = ', '.join('?' * len(keywords))
+    sql = f"""SELECT s.keyword, strftime('{fmt}', t.timestamp) AS bucket, SUM(s.frequency) AS frequency, COUNT(*) AS records
+              FROM search_index s JOIN {table} t ON t.id = s.text_id WHERE s.keyword IN ({marks}) GROUP BY s.keyword, bucket ORDER BY s.keyword, bucket"""
+    out = {k: [] for k in keywords}
+    for r in conn.execute(sql, list(keywords)): out[r['keyword']].append({'bucket': r['bucket'], 'frequency': r['frequency'], 'records': r['records']})
+    return out
@@ -1,24 +1,117 @@
-import re
+import csv
+import json
+import hashlib
+import numpy as np
 import pandas as pd
 import io
+import re
+import threading
 import time
 from collections import Counter
-from textblob import TextBlob
-from langdetect import detect
-from deep_translator import GoogleTranslator
-from concurrent.futures import ThreadPoolExecutor
+from backend_translation import get_translator
+from backend_worker_pool import parallel_scan
+from backend_rules import get_engine
+from backend_metrics import Profiler
+
+# letter-initial words of two or more characters: drops bare numbers and codes like '2017.09' from the keyword index
+TOKEN_RE = re.compile(r'[^\W\d_]\w+')
+
+_analyzer = None
+_analyzer_lock = threading.Lock()
+
+def detect_language(text):
+    # imported on first use: langdetect and its ~55 language profiles stay out of module import (see TextAnalyzer.warm_up)
+    from langdetect import detect
+    return detect(text)
+
+def get_analyzer():
+    """Process-wide TextAnalyzer, replaced (never mutated) when rules.json changes, so in-flight runs keep a consistent engine."""
+    global _analyzer
+    engine = get_engine()
+    with _analyzer_lock:
+        if _analyzer is None or _analyzer.engine is not engine: _analyzer = TextAnalyzer()
+        return _analyzer
+
+class StringReader:
+    """Read-only text file over str[start:end]: the CSV parser pulls it in bounded pieces, where io.StringIO would first copy
+    the whole body into a 4-bytes-per-character buffer."""
+
+    def __init__(self, text, start=0, end=None):
+        self.text, self.pos, self.end = text, start, len(text) if end is None else end
+
+    def read(self, size=-1):
+        stop = self.end if size is None or size < 0 else min(self.end, self.pos + size)
+        out, self.pos = self.text[self.pos:stop], stop
+        return out
+
+    def readline(self, size=-1):
+        nl = self.text.find('\n', self.pos, self.end)
+        stop = self.end if nl < 0 else nl + 1
+        if size is not None and size >= 0: stop = min(stop, self.pos + size)
+        out, self.pos = self.text[self.pos:stop], stop
+        return out
+
+    def __iter__(self):
+        return iter(self.readline, '')
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, pos):
+        self.pos = pos
+        return pos
+
+class RecordView:
+    """Rows of a pipeline result, converted to dicts only when sliced or iterated, so callers pay for just the rows they use."""
+
+    def __init__(self, df, batch=1000):
+        self.df, self.batch = df, batch
+
+    def __len__(self):
+        return len(self.df)
+
+    def __getitem__(self, key):
+        if isinstance(key, slice): return self.df.iloc[key].to_dict('records')
+        return self.df.iloc[[key]].to_dict('records')[0]
+
+    def __iter__(self):
+        for start in range(0, len(self.df), self.batch): yield from self.df.iloc[start:start + self.batch].to_dict('records')
 
 class TextAnalyzer:
     def __init__(self):
         self.stop_words = {'i', 'me', 'my', 'the', 'and', 'a', 'an', 'is', 'it', 'of', 'to', 'in', 'that', 'with'}
-        self.sentiment_rules = {
-            'positive': ['total', 'graduate', 'agriculture', 'forestry', 'fishing', 'support', 'active', 'success', 'helpful', 'profit'],
-            'negative': ['debt', 'overdraft', 'outstanding', 'issue', 'delayed', 'fail', 'error', 'poor', 'unpaid', 'loss']
-        }
-        self.pattern_registry = {
-            "Financial Indicators": r"\b(debt|overdraft|income|value|finance|bank)\b",
-            "Industrial Sectors": r"\b(agriculture|forestry|retail|manufacturing|mining)\b"
-        }
+        # sentiment_rules and pattern_registry live in rules.json, compiled once per process and shared by every analyzer
+        self.engine = get_engine()
+        self.chunk_size = 5000
+        self.head_rows = 50
+        self.parallel_min_rows = 50000
+        self.profile_rows = 10000
+        self.top_k = 3
+        self.category_max_ratio = 0.5
+        self.translate_rows = 50
+        self.sketch_size = 5000
+        self.translator = None
+
+    def rule_version(self):
+        # Any edit to the rule tables changes this, which invalidates cached results
+        rules = {'stop_words': sorted(self.stop_words), 'rules': self.engine.version}
+        return hashlib.sha1(json.dumps(rules, sort_keys=True).encode()).hexdigest()
+
+    def warm_up(self):
+        """Pays the one-off first-request costs up front: langdetect's profiles, the translation cache and pandas' parser paths."""
+        detect_language('warm up the language profiles')
+        get_translator()
+        # plainly English, so warm-up never calls the translation backend; the profilers are never finished, so /api/metrics stays clean
+        sample = ("description,industry,value\nThe total amount of debt that is still outstanding at the end of the year,All industries,1\n"
+                  "Bank overdrafts and other loans with terms of one year or less,Retail trade,2\n")
+        self.run_pipeline(sample, ['Summarization', 'Sentiment Analysis', 'Keyword Extraction'], profiler=Profiler())
+        self.run_pipeline(sample, ['Summarization'], stream=True, profiler=Profiler())
+        return self
+
+    def record_keywords(self, row):
+        """Keyword frequencies of one record's text cells, lowercased and without stop words, as stored in search_index."""
+        text = ' '.join(v for v in row.values() if isinstance(v, str)).lower()
+        return Counter(w for w in TOKEN_RE.findall(text) if w not in self.stop_words)
 
     def _get_df(self, text):
         try:
@@ -27,71 +120,361 @@ class TextAnalyzer:
             return pd.read_csv(io.StringIO(text.strip()), sep=None, engine='python', skipinitialspace=True, on_bad_lines='skip')
         except: return None
 
-    def _score_text_logic(self, t):
-        score = 0
-        text_lower = str(t).lower()
-        for word in self.sentiment_rules['positive']:
-            if word in text_lower: score += 1
-        for word in self.sentiment_rules['negative']:
-            if word in text_lower: score -= 1
-        return score
-
-    def run_pipeline(self, raw_text, operations):
-        df = self._get_df(raw_text)
+    def _iter_chunks(self, source):
+        # Milestone 5: sniff the separator once from the header line, then let the C engine parse fixed-size chunks
+        if isinstance(source, str):
+            # same bounds as source.strip(), found without copying the body
+            start, end = 0, len(source)
+            while start < end and source[start].isspace(): start += 1
+            while end > start and source[end - 1].isspace(): end -= 1
+            if start == end: return None
+            source = StringReader(source, start, end)
+        pos = source.tell()
+        try: sep = csv.Sniffer().sniff(source.readline()).delimiter
+        except csv.Error: return None
+        source.seek(pos)
+        # dtype=str keeps the raw cells so per-chunk type inference can be reconciled across the whole file
+        return pd.read_csv(source, sep=sep, engine='c', dtype=str, skipinitialspace=True, on_bad_lines='skip', chunksize=self.chunk_size)
+
+    def _fold_chunk(self, agg, chunk, candidates, profiler):
+        for c in chunk.columns:
+            s, st = chunk[c], agg[c]
+            st['raw_len'] += int(s.astype(str).str.len().sum())
+            if st['num']:
+                try: num = pd.to_numeric(s)
+                except (ValueError, TypeError): st['num'] = False
+                else:
+                    is_int = num.dtype.kind in 'iu'
+                    st['int'] = st['int'] and is_int
+                    if is_int: st['int_len'] += int(num.astype(str).str.len().sum())
+                    st['float_len'] += int(num.astype(float).astype(str).str.len().sum())
+                    st['sum'] += num.sum()
+                    st['n'] += int(num.count())
+                    continue
+            if c in candidates:
+                # numeric cells never contain a rule word, so only text chunks need scoring
+                with profiler.span('scoring', len(s)): sc, rule_hits = self.engine.scan(s)
+                st['score'] += int(sc.sum())
+                st['hits'] += int((sc != 0).sum())
+                st['rules'] += rule_hits
+        with profiler.span('keyword_counts', len(chunk)):
+            for c in candidates[:3]:
+                counts = agg[c]['counts']
+                for k, v in chunk[c].value_counts(sort=False).items(): counts[k] = counts.get(k, 0) + int(v)
+
+    def _empty_agg(self, columns):
+        return {c: {'num': True, 'int': True, 'raw_len': 0, 'int_len': 0, 'float_len': 0, 'sum': 0, 'n': 0, 'score': 0, 'hits': 0, 'rules': np.zeros(len(self.engine.rules), dtype=np.int64), 'counts': {}} for c in columns}
+
+    def _stream_profile(self, source, candidates_for, progress, profiler, keep_rows=0):
+        # the first max(head_rows, keep_rows) rows are kept: head_rows of them drive detection, the rest are only handed back
+        reader = self._iter_chunks(source)
+        if reader is None: return None
+        agg, head, total = None, None, 0
+        keep = max(self.head_rows, keep_rows or 0)
+        try:
+            for chunk in reader:
+                if agg is None:
+                    candidates = candidates_for(chunk.columns)
+                    agg = self._empty_agg(chunk.columns)
+                    head = chunk.head(0)
+                if len(head) < keep: head = pd.concat([head, chunk.head(keep - len(head))])
+                self._fold_chunk(agg, chunk, candidates, profiler)
+                total += len(chunk)
+                # the snapshot is only taken if the hook asks for it, and only while this chunk is the last one folded
+                if progress: progress(total, lambda: (agg, head, total, candidates))
+        # parser and decode errors are all ValueErrors; anything raised by the progress hook (e.g. a cancel) propagates
+        except ValueError: return None
+        if not total: return None
+        return agg, head, total, candidates
+
+    def _reconcile(self, agg, head):
+        # Reconcile dtypes the way a single read_csv would have inferred them over all rows; agg keeps the raw strings so it stays mergeable
+        head, counts = head.copy(), {}
+        for c, st in agg.items():
+            counts[c] = st['counts']
+            if not st['num']: continue
+            head[c] = pd.to_numeric(head[c]) if st['int'] else pd.to_numeric(head[c]).astype(float)
+            if st['counts']:
+                keys = pd.to_numeric(pd.Index(list(st['counts'])))
+                if not st['int']: keys = keys.astype(float)
+                merged = {}
+                for k, v in zip(keys, st['counts'].values()): merged[k] = merged.get(k, 0) + v
+                counts[c] = merged
+        return head, counts
+
+    def _merge_state(self, state, agg, head, total):
+        """Folds one upload's streaming aggregates into a dataset's running state, in place.
+
+        Every aggregate is a sum or a flag, so merging costs O(columns + distinct delta values), not O(rows so far). Value
+        counts are bounded at sketch_size per column: the heaviest are kept and 'count_err' bounds how far any kept count
+        may be under its true value.
+        """
+        if not state:
+            state.update(columns=list(head.columns), total=0, head=head.head(0), agg=self._empty_agg(head.columns))
+            for st in state['agg'].values(): st['count_err'] = 0
+        for c, new in agg.items():
+            st = state['agg'][c]
+            st['num'], st['int'] = st['num'] and new['num'], st['int'] and new['int']
+            for k in ('raw_len', 'int_len', 'float_len', 'sum', 'n', 'score', 'hits'): st[k] += new[k]
+            st['rules'] = np.asarray(st['rules'], dtype=np.int64) + new['rules']
+            counts = st['counts']
+            for k, v in new['counts'].items(): counts[k] = counts.get(k, 0) + v
+            if len(counts) > self.sketch_size:
+                # filtered in first-appearance order, so ties still break the way a single pass breaks them
+                keep = set(sorted(counts, key=counts.get, reverse=True)[:self.sketch_size])
+                st['count_err'] += max(v for k, v in counts.items() if k not in keep)
+                st['counts'] = {k: v for k, v in counts.items() if k in keep}
+        # the dataset's first head_rows rows drive language detection and the translation correction, exactly as in one upload
+        if len(state['head']) < self.head_rows: state['head'] = pd.concat([state['head'], head.head(self.head_rows - len(state['head']))])
+        state['total'] += total
+
+    def _score_column(self, values):
+        return self.engine.scan(values)[0]
+
+    def _value_counts(self, s, parallel):
+        if parallel and s.dtype == object and len(s) >= self.parallel_min_rows:
+            part = parallel_scan(s.dropna().astype(str).tolist(), want_scores=False, want_counts=True)
+            if part is not None: return pd.Series(list(part['counts'].values()), index=list(part['counts']), dtype='int64').sort_values(ascending=False)
+        return s.value_counts()
+
+    def _translate(self, values, lang):
+        # Step 2b: cached, deduped translation (a stub backend can be plugged in via self.translator); the flag is True when
+        # some value came back untranslated, so the report scored its original text
+        translated, failed = (self.translator or get_translator()).translate_batch([str(x) for x in values], lang)
+        return translated, failed > 0
+
+    def _profile_columns(self, df):
+        """One pass per column over a seeded sample of at most profile_rows rows: dtype, average length, cardinality and top-k.
+
+        When the sample is the whole frame, 'top' holds exact counts; otherwise it's only a sample estimate.
+        """
+        sample = df if len(df) <= self.profile_rows else df.sample(self.profile_rows, random_state=0)
+        exact = sample is df
+        profile = {}
+        for c in df.columns:
+            s = sample[c]
+            counts = s.value_counts()
+            profile[c] = {'dtype': str(s.dtype), 'numeric': pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s),
+                          'avg_len': float(s.astype(str).str.len().mean()), 'cardinality': len(counts), 'top': counts.head(self.top_k), 'exact': exact}
+        return profile
+
+    def _encode_categories(self, df, columns):
+        # Text columns whose sampled distinct values are at most category_max_ratio of the sampled rows become categoricals.
+        # factorize keeps first-appearance order (one hash pass), so value_counts ties still break the way they did on the object column.
+        limit = self.category_max_ratio * min(len(df), self.profile_rows)
+        for c, col in columns.items():
+            if df[c].dtype == object and col['cardinality'] <= limit:
+                codes, uniques = pd.factorize(df[c])
+                df[c] = pd.Categorical.from_codes(codes, uniques)
+                col['encoding'] = 'category'
+
+    def _candidates(self, columns):
+        return [c for c in columns if c.lower() not in ['id', 'value', 'line_code', 'year']]
+
+    def run_pipeline(self, raw_text, operations, stream=False, parallel=False, progress=None, profiler=None, state=None, keep_rows=None):
+        """Returns (results, rows, stats, scores): rows is a RecordView and scores a numpy array, or both None on bad input.
+
+        The in-memory path returns every row; the streaming path returns the first max(head_rows, keep_rows) rows.
+        state is a dataset's running aggregates ({} for a new dataset): only raw_text's rows are parsed and folded into it,
+        in place, and the outputs cover every row appended so far. Implies stream.
+        """
+        # Callers that time more than the pipeline (e.g. persistence) pass their own profiler and finish it themselves
+        own = profiler is None
+        if own: profiler = Profiler().start()
+        if stream or state is not None: out = self._run_streaming(raw_text, operations, progress, profiler, state, keep_rows)
+        else: out = self._run_in_memory(raw_text, operations, parallel, profiler)
+        if own: profiler.finish()
+        return out
+
+    def _run_in_memory(self, raw_text, operations, parallel, profiler):
+        start_time = time.time()
+        with profiler.span('parse') as sp:
+            df = self._get_df(raw_text)
+            sp['rows'] = 0 if df is None else len(df)
         if df is None or df.empty:
             return [{"title": "Error", "output": "Invalid Data Format", "success": False}], None, None, None
 
-        start_time = time.time()
         total_records = len(df)
-        candidates = [c for c in df.columns if c.lower() not in ['id', 'value', 'line_code', 'year']]
-        target_col = max(candidates, key=lambda c: df[c].astype(str).str.len().mean())
-
-        # Milestone 2: Regex Pattern Filtering
-        sample_block = " ".join(df[target_col].astype(str).head(20)).lower() 
-        detected_patterns = [p for p, reg in self.pattern_registry.items() if re.findall(reg, sample_block)]
+        # Milestone 5: profile a bounded sample once; target selection, keywords and summarization all reuse it
+        with profiler.span('profile', min(total_records, self.profile_rows)): columns = self._profile_columns(df)
+        with profiler.span('encode', total_records): self._encode_categories(df, columns)
+        with profiler.span('target', total_records):
+            candidates = self._candidates(df.columns)
+            target_col = max(candidates, key=lambda c: columns[c]['avg_len'])
 
         # Step 2: Language Detection
-        try: lang = detect(" ".join(df[target_col].astype(str).head(5)))
-        except: lang = 'en'
+        with profiler.span('language', min(total_records, 5)):
+            try: lang = detect_language(" ".join(df[target_col].head(5).astype(str)))
+            except: lang = 'en'
         
         working_col = target_col
-        if lang != 'en':
-            translator = GoogleTranslator(source='auto', target='en')
-            translate_limit = min(total_records, 50)
-            with ThreadPoolExecutor(max_workers=10) as ex:
-                translated = list(ex.map(lambda x: translator.translate(str(x)), df[target_col].head(translate_limit).tolist()))
-            df[f'{target_col}_en'] = df[target_col]
-            df.iloc[0:translate_limit, df.columns.get_loc(f'{target_col}_en')] = translated
+        target = df[target_col]
+        incomplete = False
+        if lang != 'en' and isinstance(target.dtype, pd.CategoricalDtype):
+            # same rows as the plain branch (and the streaming path): only the first translate_rows rows are translated, but each
+            # distinct value among them is sent once and the column stays encoded
+            translate_limit = min(total_records, self.translate_rows)
+            with profiler.span('translation', translate_limit):
+                categories = target.cat.categories.to_numpy(dtype=object)
+                codes = target.cat.codes.to_numpy()
+                head_codes = codes[:translate_limit]
+                present = np.unique(head_codes[head_codes >= 0])
+                translated, incomplete = self._translate(categories[present].tolist(), lang)
+                # translations become extra categories (re-factorized, as two values may translate alike); only the head's codes move to them
+                tcodes, tuniques = pd.factorize(np.concatenate([categories, np.asarray(translated, dtype=object)]))
+                moved = np.arange(len(categories))
+                moved[present] = len(categories) + np.arange(len(present))
+                new_codes = np.where(codes < 0, -1, tcodes[codes])
+                new_codes[:translate_limit] = np.where(head_codes < 0, -1, tcodes[moved[head_codes]])
+                df[f'{target_col}_en'] = pd.Categorical.from_codes(new_codes, tuniques)
+            working_col = f'{target_col}_en'
+        elif lang != 'en':
+            translate_limit = min(total_records, self.translate_rows)
+            with profiler.span('translation', translate_limit):
+                translated, incomplete = self._translate(target.head(translate_limit).tolist(), lang)
+                df[f'{target_col}_en'] = target.astype(object)
+                df.iloc[0:translate_limit, df.columns.get_loc(f'{target_col}_en')] = translated
             working_col = f'{target_col}_en'
 
-        # Milestone 3: Parallel Logic
-        with ThreadPoolExecutor(max_workers=15) as ex:
-            scores = list(ex.map(self._score_text_logic, df[working_col].tolist()))
-        
-        avg_score = sum(scores) / len(scores) if scores else 0
-        results = []
+        # Milestones 2 & 3: one rule-engine pass scores every row and counts pattern hits over the full column, sharded for large columns
+        with profiler.span('scoring', total_records):
+            # a categorical column is scanned once per category, so sharding it across processes wouldn't pay off
+            sharded = parallel and total_records >= self.parallel_min_rows and not isinstance(df[working_col].dtype, pd.CategoricalDtype)
+            part = parallel_scan(df[working_col].astype(str).tolist(), self.engine) if sharded else None
+            scores, rule_hits = (part['scores'], part['rule_hits']) if part is not None else self.engine.scan(df[working_col])
+        with profiler.span('patterns', total_records): detected_patterns = self.engine.patterns(rule_hits)
+
+        avg_score = int(scores.sum()) / len(scores) if len(scores) else 0
+        means, tops = {}, {}
+        if "Summarization" in operations:
+            with profiler.span('op:Summarization', total_records): means = {c: df[c].mean() for c, col in columns.items() if col['numeric']}
+        if "Keyword Extraction" in operations:
+            # the profile's counts are exact when it saw every row; only larger frames need a full counting pass
+            with profiler.span('op:Keyword Extraction', total_records):
+                tops = {c: columns[c]['top'] if columns[c]['exact'] else self._value_counts(df[c], parallel).head(self.top_k) for c in candidates[:3]}
+        results = self._render(operations, total_records, detected_patterns, means, avg_score, int(np.count_nonzero(scores)), tops, lang, profiler)
+
+        stats = {"total_chunks": (total_records // 10) + 1, "total_records": total_records, "processing_time": time.time() - start_time, "alert": avg_score < -0.3, "avg_score": avg_score,
+                 "translation_incomplete": incomplete,
+                 "columns": {c: {'dtype': col['dtype'], 'avg_len': col['avg_len'], 'cardinality': col['cardinality'], 'encoding': col.get('encoding', 'plain')} for c, col in columns.items()}, "stages": profiler.report()}
+        return results, RecordView(df), stats, scores
 
+    def _run_streaming(self, source, operations, progress, profiler, state=None, keep_rows=None):
+        # Same outputs as the in-memory path, but only the aggregates and the first head_rows rows are ever held
+        start_time = time.time()
+        # progress(done, interim) gets each chunk's running count and a callable rendering the report over the rows so far
+        hook = progress and (lambda done, snapshot: progress(done, lambda: self._interim_report(operations, *snapshot())))
+        # parsing and folding are interleaved here, so 'parse' includes the per-chunk 'scoring' and 'keyword_counts' spans
+        with profiler.span('parse') as sp:
+            profile = self._stream_profile(source, self._candidates, hook, profiler, keep_rows)
+            sp['rows'] = profile[2] if profile else 0
+        if profile is None:
+            return [{"title": "Error", "output": "Invalid Data Format", "success": False}], None, None, None
+        agg, kept, total_records, candidates = profile
+        head = kept.head(self.head_rows)
+        appended = total_records
+        if state is not None:
+            if state and state['columns'] != list(head.columns):
+                return [{"title": "Error", "output": "Columns don't match the dataset", "success": False}], None, None, None
+            with profiler.span('merge', total_records):
+                self._merge_state(state, agg, head, total_records)
+                agg, head, total_records = state['agg'], state['head'], state['total']
+        head, counts = self._reconcile(agg, head)
+
+        with profiler.span('target', total_records): target_col = max(candidates, key=lambda c: self._col_len(agg[c]) / total_records)
+
+        with profiler.span('language', min(len(head), 5)):
+            try: lang = detect_language(" ".join(head[target_col].astype(str).head(5)))
+            except: lang = 'en'
+
+        total_score, matches, rule_hits = agg[target_col]['score'], agg[target_col]['hits'], agg[target_col]['rules']
+        incomplete = False
+        with profiler.span('scoring', len(head)):
+            head_scores, head_hits = self.engine.scan(head[target_col])
+            head_scores = head_scores.tolist()
+        if lang != 'en':
+            with profiler.span('translation', len(head)):
+                translated, incomplete = self._translate(head[target_col].tolist(), lang)
+                head[f'{target_col}_en'] = translated
+            with profiler.span('scoring', len(head)):
+                translated_scores, translated_hits = self.engine.scan(translated)
+                translated_scores = translated_scores.tolist()
+            total_score += sum(translated_scores) - sum(head_scores)
+            matches += sum(1 for s in translated_scores if s != 0) - sum(1 for s in head_scores if s != 0)
+            rule_hits = rule_hits + translated_hits - head_hits
+            head_scores = translated_scores
+        with profiler.span('patterns', total_records): detected_patterns = self.engine.patterns(rule_hits)
+
+        avg_score = total_score / total_records
+        means, tops = self._summaries(agg, counts, candidates)
+        results = self._render(operations, total_records, detected_patterns, means, avg_score, matches, tops, lang, profiler)
+
+        stats = {"total_chunks": (total_records // 10) + 1, "total_records": total_records, "processing_time": time.time() - start_time, "alert": avg_score < -0.3, "avg_score": avg_score,
+                 "translation_incomplete": incomplete, "stages": profiler.report()}
+        if state is not None:
+            # the rows handed back for persistence are the appended ones, translated and scored the way one upload's rows are
+            head, _ = self._reconcile(agg, kept)
+            values = head[target_col]
+            if lang != 'en':
+                n = min(len(head), self.head_rows)
+                with profiler.span('translation', n): translated, delta_incomplete = self._translate(values.head(n).tolist(), lang)
+                head[f'{target_col}_en'] = values = translated + values.iloc[n:].tolist()
+                incomplete = incomplete or delta_incomplete
+            with profiler.span('scoring', len(head)): head_scores = self.engine.scan(values)[0]
+            stats.update(appended_records=appended, translation_incomplete=incomplete, count_error={c: agg[c]['count_err'] for c in candidates[:3]}, stages=profiler.report())
+        elif len(kept) > len(head):
+            # rows kept past the head are handed back as the in-memory path has them: untranslated, scored on their own text
+            rest, _ = self._reconcile(agg, kept.iloc[len(head):])
+            if lang != 'en': rest[f'{target_col}_en'] = rest[target_col]
+            with profiler.span('scoring', len(rest)): head_scores = head_scores + self.engine.scan(rest[target_col])[0].tolist()
+            head = pd.concat([head, rest])
+        return results, RecordView(head), stats, np.asarray(head_scores, dtype=np.int64)
+
+    @staticmethod
+    def _col_len(st):
+        # a streamed column's total text length, measured the way read_csv would have typed it
+        return st['raw_len'] if not st['num'] else st['int_len'] if st['int'] else st['float_len']
+
+    @staticmethod
+    def _summaries(agg, counts, candidates):
+        means = {c: (st['sum'] / st['n'] if st['n'] else float('nan')) for c, st in agg.items() if st['num']}
+        tops = {c: pd.Series(list(counts[c].values()), index=list(counts[c]), dtype='int64').sort_values(ascending=False).head(3) for c in candidates[:3]}
+        return means, tops
+
+    def _interim_report(self, operations, agg, head, total_records, candidates):
+        """(results, stats) over the rows streamed so far: the final report's aggregates without the translation correction, marked partial."""
+        head, counts = self._reconcile(agg, head.head(self.head_rows))
+        target_col = max(candidates, key=lambda c: self._col_len(agg[c]))
+        try: lang = detect_language(" ".join(head[target_col].astype(str).head(5)))
+        except: lang = 'en'
+        st = agg[target_col]
+        avg_score = st['score'] / total_records
+        means, tops = self._summaries(agg, counts, candidates)
+        # a throwaway profiler: interim renders don't belong in the run's stages
+        results = self._render(operations, total_records, self.engine.patterns(st['rules']), means, avg_score, st['hits'], tops, lang, Profiler())
+        return results, {"total_records": total_records, "avg_score": avg_score, "alert": avg_score < -0.3, "partial": True}
+
+    def _render(self, operations, total_records, detected_patterns, means, avg_score, matches, tops, lang, profiler):
+        results = []
         for op in operations:
-            output = ""
-            if op == "Summarization":
-                output = f"📊 Data Analysis: {total_records} Records\n- Patterns: {', '.join(detected_patterns) if detected_patterns else 'Factual'}\n"
-                num_df = df.select_dtypes(include=['number'])
-                for col in num_df.columns:
-                    if 'id' not in col.lower(): output += f"- Avg {col}: {df[col].mean():.2f}\n"
-            elif op == "Sentiment Analysis":
-                label = "Growth/Positive" if avg_score > 0 else "Risk/Negative" if avg_score < 0 else "Neutral"
-                output = f"🧠 Scorer: {label}\n- Index: {avg_score:.2f}\n- Matches: {sum(1 for s in scores if s != 0)}"
-            elif op == "Keyword Extraction":
-                output = "🔑 Category Frequency:\n"
-                for col in candidates[:3]:
-                    top = df[col].value_counts().head(3)
-                    output += f"- {col}: " + ", ".join([f"{k}({v})" for k, v in top.items()]) + "\n"
-            elif op == "Translation":
-                output = f"🌐 Detect: {lang.upper()}\n- Target: English Standard Analysis."
-            else:
-                output = "Status: Not Applicable\nReason: Dataset contains factual categorical data."
-
-            results.append({"title": op, "output": output, "success": True})
-
-        stats = {"total_chunks": (total_records // 10) + 1, "processing_time": time.time() - start_time, "alert": avg_score < -0.3, "avg_score": avg_score}
-        return results, df.to_dict('records'), stats, scores
\ No newline at end of file
+            with profiler.span(f'op:{op}'):
+                output = ""
+                if op == "Summarization":
+                    patterns = ', '.join(f"{p}({n})" for p, n in detected_patterns.items())
+                    output = f"📊 Data Analysis: {total_records} Records\n- Patterns: {patterns or 'Factual'}\n"
+                    for col, mean in means.items():
+                        if 'id' not in col.lower(): output += f"- Avg {col}: {mean:.2f}\n"
+                elif op == "Sentiment Analysis":
+                    label = "Growth/Positive" if avg_score > 0 else "Risk/Negative" if avg_score < 0 else "Neutral"
+                    output = f"🧠 Scorer: {label}\n- Index: {avg_score:.2f}\n- Matches: {matches}"
+                elif op == "Keyword Extraction":
+                    output = "🔑 Category Frequency:\n"
+                    for col, top in tops.items():
+                        output += f"- {col}: " + ", ".join([f"{k}({v})" for k, v in top.items()]) + "\n"
+                elif op == "Translation":
+                    output = f"🌐 Detect: {lang.upper()}\n- Target: English Standard Analysis."
+                else:
+                    output = "Status: Not Applicable\nReason: Dataset contains factual categorical data."
+
+                results.append({"title": op, "output": output, "success": True})
+        return results
\ No newline at end of file
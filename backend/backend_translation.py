@@ -0,0 +1,101 @@
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
+CACHE_PATH = 'translation_cache.db'
+_default = None
+_config = {}
+
+class GoogleBackend:
+    URL = 'https://translate.google.com/m'
+
+    def __init__(self, target='en', timeout=10):
+        self.target, self.timeout = target, timeout
+
+    def translate(self, text, source):
+        # the endpoint and result element deep_translator's GoogleTranslator scrapes, but with a per-request timeout (it has none),
+        # so a hung call can't hold a worker forever; imported on first miss since requests and bs4 are slow to import
+        import requests
+        from bs4 import BeautifulSoup
+        text = text.strip()
+        if not text: return text
+        resp = requests.get(self.URL, params={'sl': 'auto', 'tl': self.target, 'q': text}, timeout=self.timeout)
+        resp.raise_for_status()
+        soup = BeautifulSoup(resp.text, 'html.parser')
+        element = soup.find('div', {'class': 't0'}) or soup.find('div', {'class': 'result-container'})
+        return element.get_text(strip=True) if element else None
+
+class TranslationLayer:
+    """Dedupes cells, serves repeats from a persistent SQLite LRU and sends only the misses to the backend."""
+
+    def __init__(self, backend=None, path=CACHE_PATH, max_entries=100000, workers=10, timeout=10):
+        self.config = {'backend': backend, 'path': path, 'max_entries': max_entries, 'workers': workers, 'timeout': timeout}
+        self.backend = backend or GoogleBackend(timeout=timeout)
+        self.max_entries, self.workers, self.timeout = max_entries, workers, timeout
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'failed': 0}
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute('CREATE TABLE IF NOT EXISTS translations (source TEXT, text TEXT, translated TEXT, last_used REAL, PRIMARY KEY (source, text))')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_translations_lru ON translations(last_used)')
+        self.conn.commit()
+
+    def _lookup(self, source, texts):
+        found = {}
+        with self.lock:
+            for i in range(0, len(texts), 500):
+                part = texts[i:i + 500]
+                rows = self.conn.execute(f"SELECT text, translated FROM translations WHERE source = ? AND text IN ({','.join('?' * len(part))})", (source, *part)).fetchall()
+                found.update(rows)
+            if found:
+                now = time.time()
+                self.conn.executemany("UPDATE translations SET last_used = ? WHERE source = ? AND text = ?", [(now, source, t) for t in found])
+                self.conn.commit()
+        return found
+
+    def _store(self, source, pairs):
+        now = time.time()
+        with self.lock:
+            self.conn.executemany("INSERT OR REPLACE INTO translations (source, text, translated, last_used) VALUES (?, ?, ?, ?)", [(source, t, tr, now) for t, tr in pairs.items()])
+            self.conn.execute("DELETE FROM translations WHERE rowid IN (SELECT rowid FROM translations ORDER BY last_used DESC LIMIT -1 OFFSET ?)", (self.max_entries,))
+            self.conn.commit()
+
+    def _fetch(self, texts, source):
+        # One bounded batch for all misses; anything unfinished at the deadline keeps its original text and isn't cached.
+        # Each batch gets its own threads: a call still running at the deadline is left to its own request timeout without
+        # taking a slot from later batches
+        executor = ThreadPoolExecutor(max_workers=min(self.workers, len(texts)))
+        futures = {executor.submit(self.backend.translate, t, source): t for t in texts}
+        done, pending = wait(futures, timeout=self.timeout)
+        executor.shutdown(wait=False, cancel_futures=True)
+        fetched = {futures[f]: f.result() for f in done if f.exception() is None and f.result() is not None}
+        self.stats['failed'] += len(texts) - len(fetched)
+        if fetched: self._store(source, fetched)
+        return fetched
+
+    def translate_batch(self, texts, source):
+        """(translations, failed): texts that couldn't be translated come back unchanged, and `failed` counts the distinct ones."""
+        unique = list(dict.fromkeys(texts))
+        found = self._lookup(source, unique)
+        misses = [t for t in unique if t not in found]
+        self.stats['hits'] += len(unique) - len(misses)
+        self.stats['misses'] += len(misses)
+        fetched = self._fetch(misses, source) if misses else {}
+        found.update(fetched)
+        return [found.get(t, t) for t in texts], len(misses) - len(fetched)
+
+    def translate(self, texts, source):
+        return self.translate_batch(texts, source)[0]
+
+def get_translator():
+    global _default
+    if _default is None: _default = TranslationLayer(**_config)
+    return _default
+
+def _reset_in_child():
+    # SQLite connections must not cross fork(): a forked worker drops the inherited layer and its next get_translator() opens its own, with the same backend and settings
+    global _default, _config
+    if _default is not None: _default, _config = None, _default.config
+
+os.register_at_fork(after_in_child=_reset_in_child)
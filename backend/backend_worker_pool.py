@@ -0,0 +1,78 @@
+import os
+import threading
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context, get_all_start_methods, resource_tracker, shared_memory
+
+SEP = '\x00'
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool(workers=None):
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # fork keeps the warm-up cheap (no re-import of the Flask module); spawn elsewhere
+            ctx = get_context('fork') if 'fork' in get_all_start_methods() else get_context()
+            _pool = ProcessPoolExecutor(max_workers=workers or os.cpu_count() or 1, mp_context=ctx)
+        return _pool
+
+def _ping(_):
+    return os.getpid()
+
+def warm_pool(workers=None):
+    # Call at startup, before the server spins up threads, so requests never pay for forking workers
+    pool = get_pool(workers)
+    list(pool.map(_ping, range(pool._max_workers)))
+    return pool
+
+def _scan_shard(name, start, stop, engine, want_scores, want_counts):
+    shm = shared_memory.SharedMemory(name=name)
+    # the parent owns and unlinks the block; stop this worker's tracker from "cleaning it up" at exit
+    resource_tracker.unregister(shm._name, 'shared_memory')
+    try: cells = bytes(shm.buf[start:stop]).decode().split(SEP)
+    finally: shm.close()
+    out = {'rows': len(cells)}
+    if want_scores:
+        scores, rule_hits = engine.scan(cells)
+        out.update(scores=scores, score=int(scores.sum()), hits=int(np.count_nonzero(scores)), rule_hits=rule_hits)
+    if want_counts:
+        out['counts'] = pd.Series(cells, dtype=object).value_counts(sort=False).to_dict()
+    return out
+
+def parallel_scan(cells, engine=None, want_scores=True, want_counts=False):
+    """Shard string cells across the pool through one shared-memory buffer and merge the partial aggregates.
+
+    Returns None when the column can't be framed with SEP, so callers fall back to the serial path.
+    """
+    if not cells: return None
+    payload = SEP.join(cells).encode()
+    if payload.count(SEP.encode()) != len(cells) - 1: return None
+    pool = get_pool()
+    shm = shared_memory.SharedMemory(create=True, size=max(len(payload), 1))
+    try:
+        shm.buf[:len(payload)] = payload
+        bounds, start = [], 0
+        for k in range(1, pool._max_workers):
+            cut = payload.find(b'\x00', max(start, len(payload) * k // pool._max_workers))
+            if cut < 0: break
+            bounds.append((start, cut))
+            start = cut + 1
+        bounds.append((start, len(payload)))
+        parts = list(pool.map(_scan_shard, *zip(*[(shm.name, a, b, engine, want_scores, want_counts) for a, b in bounds])))
+    finally:
+        shm.close()
+        shm.unlink()
+
+    merged = {'rows': sum(p['rows'] for p in parts)}
+    if want_scores:
+        merged.update(scores=np.concatenate([p['scores'] for p in parts]), score=sum(p['score'] for p in parts), hits=sum(p['hits'] for p in parts),
+                      rule_hits=sum(p['rule_hits'] for p in parts))
+    if want_counts:
+        # shards come back in order, so dict insertion keeps global first-occurrence order (same tie order as value_counts)
+        counts = {}
+        for p in parts:
+            for k, v in p['counts'].items(): counts[k] = counts.get(k, 0) + v
+        merged['counts'] = counts
+    return merged
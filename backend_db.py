@@ -0,0 +1,66 @@
+import sqlite3
+import threading
+import queue
+import atexit
+import logging
+from contextlib import contextmanager, nullcontext
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+class ConnectionPool:
+    """Reuses tuned SQLite connections across requests; writers are serialized so WAL readers never wait on them."""
+
+    def __init__(self, path, size=8, mmap_size=256 * 1024 * 1024, busy_timeout=5000):
+        self.path, self.mmap_size, self.busy_timeout = path, mmap_size, busy_timeout
+        self.idle = queue.LifoQueue(maxsize=size)
+        self.write_lock = threading.Lock()
+
+    def _open(self):
+        # Pragmas are applied once per connection; cached_statements keeps the prepared statements across requests
+        conn = sqlite3.connect(self.path, check_same_thread=False, cached_statements=256)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute(f'PRAGMA mmap_size={int(self.mmap_size)}')
+        conn.execute(f'PRAGMA busy_timeout={int(self.busy_timeout)}')
+        return conn
+
+    @contextmanager
+    def connection(self, write=False):
+        try: conn = self.idle.get_nowait()
+        except queue.Empty: conn = self._open()
+        try:
+            with self.write_lock if write else nullcontext():
+                with conn: yield conn
+        finally:
+            try: self.idle.put_nowait(conn)
+            except queue.Full: conn.close()
+
+def pool_for(path):
+    with _pools_lock:
+        if path not in _pools: _pools[path] = ConnectionPool(path)
+        return _pools[path]
+
+class WriteQueue:
+    """One background thread applying persistence jobs in submission order, so HTTP latency excludes disk I/O."""
+
+    def __init__(self):
+        self.jobs = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+
+    def submit(self, fn, *args):
+        with self.lock:
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='sqlite-writer', daemon=True)
+                self.thread.start()
+                atexit.register(self.jobs.join)
+        self.jobs.put((fn, args))
+
+    def _run(self):
+        while True:
+            fn, args = self.jobs.get()
+            try: fn(*args)
+            except Exception: logging.exception("background write failed")
+            finally: self.jobs.task_done()
@@ -0,0 +1,86 @@
+import json
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+TERMINAL = ('completed', 'failed', 'cancelled')
+
+class JobCancelled(Exception):
+    pass
+
+class JobManager:
+    """Runs TextAnalyzer pipelines on a bounded worker pool and records their progress in batch_results."""
+
+    def __init__(self, get_db, analyzer_factory, on_complete=None, workers=2, keep_rows=None, interim_every=1.0):
+        self.get_db, self.analyzer_factory, self.on_complete, self.keep_rows = get_db, analyzer_factory, on_complete, keep_rows
+        # seconds between interim reports: rendering one costs far more than a progress update, so most chunks only bump the count
+        self.interim_every = interim_every
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='analysis-job')
+        self.jobs = {}
+        self.lock = threading.Lock()
+
+    def _update(self, batch_id, sql='', **fields):
+        sets = [f'{k} = ?' for k in fields] + ([sql] if sql else [])
+        with self.get_db(write=True) as db:
+            db.execute(f"UPDATE batch_results SET {', '.join(sets)} WHERE batch_id = ?", (*fields.values(), batch_id))
+
+    def submit(self, text, operations, filename):
+        batch_id = uuid.uuid4().hex
+        # line count is a cheap estimate until the stream finishes and reports the exact total
+        with self.get_db(write=True) as db:
+            db.execute("""INSERT INTO batch_results (batch_id, filename, total_records, processed_records, failed_records, status)
+                          VALUES (?, ?, ?, 0, 0, 'queued')""", (batch_id, filename, max(text.count('\n'), 1)))
+        cancel = threading.Event()
+        with self.lock:
+            self.jobs[batch_id] = {'cancel': cancel, 'future': self.executor.submit(self._run, batch_id, text, operations, filename, cancel)}
+        return batch_id
+
+    def _run(self, batch_id, text, operations, filename, cancel):
+        last_interim = [0.0]
+        def progress(done, interim=None):
+            if cancel.is_set(): raise JobCancelled()
+            fields = {'processed_records': done}
+            if interim is not None and time.monotonic() - last_interim[0] >= self.interim_every:
+                # the partial report (stats.partial) stands in report_data until the final one replaces it
+                results, stats = interim()
+                fields['report_data'] = json.dumps({"results": results, "stats": stats})
+                last_interim[0] = time.monotonic()
+            self._update(batch_id, **fields)
+
+        try:
+            if cancel.is_set(): raise JobCancelled()
+            self._update(batch_id, "start_time = CURRENT_TIMESTAMP", status='running')
+            results, rows, stats, scores = self.analyzer_factory().run_pipeline(text, operations, stream=True, progress=progress, keep_rows=self.keep_rows)
+            if rows is None:
+                self._update(batch_id, "end_time = CURRENT_TIMESTAMP", status='failed', report_data=json.dumps(results))
+                return
+            if self.on_complete: self.on_complete(filename, operations, results, stats, rows, scores)
+            self._update(batch_id, "end_time = CURRENT_TIMESTAMP", status='completed', total_records=stats['total_records'],
+                         processed_records=stats['total_records'], report_data=json.dumps({"results": results, "stats": stats}))
+        except JobCancelled:
+            self._update(batch_id, "end_time = CURRENT_TIMESTAMP", status='cancelled')
+        except Exception as e:
+            self._update(batch_id, "end_time = CURRENT_TIMESTAMP, failed_records = total_records - processed_records", status='failed',
+                         report_data=json.dumps([{"title": "Error", "output": str(e), "success": False}]))
+        finally:
+            with self.lock: self.jobs.pop(batch_id, None)
+
+    def status(self, batch_id):
+        with self.get_db() as db:
+            row = db.execute("SELECT * FROM batch_results WHERE batch_id = ?", (batch_id,)).fetchone()
+        if row is None: return None
+        job = dict(row)
+        report = job.pop('report_data', None)
+        if report: job['report'] = json.loads(report)
+        return job
+
+    def cancel(self, batch_id):
+        with self.lock: job = self.jobs.get(batch_id)
+        if job is None: return False
+        job['cancel'].set()
+        # still queued: the worker will never start it, so record the cancel here
+        if job['future'].cancel():
+            self._update(batch_id, "end_time = CURRENT_TIMESTAMP", status='cancelled')
+            with self.lock: self.jobs.pop(batch_id, None)
+        return True
@@ -0,0 +1,131 @@
+import bisect
+import cProfile
+import io
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+
+try: _PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024
+except (AttributeError, ValueError, OSError): _PAGE_KB = None
+
+BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, float('inf'))
+_capture_lock = threading.Lock()
+
+def _rss_kb():
+    # current (not lifetime-peak) resident set size; None where /proc isn't available
+    if _PAGE_KB is None: return None
+    try:
+        with open('/proc/self/statm', 'rb') as f: return int(f.read().split()[1]) * _PAGE_KB
+    except (OSError, ValueError, IndexError): return None
+
+class StageMetrics:
+    """Latency histograms per pipeline stage: fixed buckets over the process lifetime, percentiles over a recent window."""
+
+    def __init__(self, window=1024):
+        self.window = window
+        self.stages = {}
+        self.lock = threading.Lock()
+
+    def observe(self, name, seconds):
+        with self.lock:
+            st = self.stages.get(name)
+            if st is None: st = self.stages[name] = {'count': 0, 'total': 0.0, 'max': 0.0, 'buckets': [0] * len(BUCKETS_MS), 'recent': deque(maxlen=self.window)}
+            ms = seconds * 1000
+            st['count'] += 1
+            st['total'] += seconds
+            st['max'] = max(st['max'], seconds)
+            st['buckets'][bisect.bisect_left(BUCKETS_MS, ms)] += 1
+            st['recent'].append(seconds)
+
+    def snapshot(self):
+        with self.lock: stages = {k: dict(v, recent=sorted(v['recent'])) for k, v in self.stages.items()}
+        out = {}
+        for name, st in stages.items():
+            recent = st['recent']
+            pct = lambda q: recent[min(len(recent) - 1, int(q * len(recent)))]
+            out[name] = {'count': st['count'], 'mean': st['total'] / st['count'], 'max': st['max'],
+                         'p50': pct(0.50), 'p95': pct(0.95), 'p99': pct(0.99),
+                         'histogram_ms': {('+Inf' if b == float('inf') else str(b)): n for b, n in zip(BUCKETS_MS, st['buckets'])}}
+        return out
+
+    def reset(self):
+        with self.lock: self.stages.clear()
+
+metrics = StageMetrics()
+
+class Profiler:
+    """Collects named timing spans (with row counts and peak memory) for one pipeline run.
+
+    Spans with the same name accumulate. With capture=True the run is also traced with cProfile and tracemalloc;
+    captures are serialized process-wide because tracemalloc is global.
+    """
+
+    def __init__(self, capture=False):
+        self.capture = capture
+        self.spans = {}
+        self.stack = []
+        self.started = None
+        self.cprofile = None
+
+    def start(self):
+        self.started = time.perf_counter()
+        if self.capture:
+            _capture_lock.acquire()
+            tracemalloc.start()
+            self.cprofile = cProfile.Profile()
+            self.cprofile.enable()
+        return self
+
+    @contextmanager
+    def span(self, name, rows=None):
+        """Times the block; the yielded dict's 'rows' can be set inside it when the count is only known afterwards."""
+        if self.capture and self.stack:
+            # fold the parent's peak so far into it before resetting the tracemalloc high-water mark for this span
+            self.stack[-1][1] = max(self.stack[-1][1], tracemalloc.get_traced_memory()[1])
+        if self.capture: tracemalloc.reset_peak()
+        frame, meta = [name, 0], {'rows': rows}
+        self.stack.append(frame)
+        rss0 = _rss_kb()
+        t0 = time.perf_counter()
+        try: yield meta
+        finally:
+            seconds = time.perf_counter() - t0
+            rss1 = _rss_kb()
+            self.stack.pop()
+            sp = self.spans.setdefault(name, {'name': name, 'seconds': 0.0, 'calls': 0, 'rows': None, 'rss_delta_kb': None})
+            sp['seconds'] += seconds
+            sp['calls'] += 1
+            if meta['rows'] is not None: sp['rows'] = (sp['rows'] or 0) + meta['rows']
+            # largest RSS growth over one call; process-wide, so concurrent requests show up too (capture mode gives traced peaks)
+            if rss0 is not None and rss1 is not None:
+                sp['rss_delta_kb'] = rss1 - rss0 if sp['rss_delta_kb'] is None else max(sp['rss_delta_kb'], rss1 - rss0)
+            if self.capture:
+                peak = max(frame[1], tracemalloc.get_traced_memory()[1])
+                sp['traced_peak_kb'] = max(sp.get('traced_peak_kb', 0), peak // 1024)
+                if self.stack: self.stack[-1][1] = max(self.stack[-1][1], peak)
+                tracemalloc.reset_peak()
+
+    def report(self):
+        return [dict(sp) for sp in self.spans.values()]
+
+    def finish(self, top=25):
+        """Stops any capture, feeds every span (and the run total) into the process-wide histograms; returns the capture, if any."""
+        total = time.perf_counter() - self.started if self.started is not None else None
+        capture = None
+        if self.cprofile is not None:
+            self.cprofile.disable()
+            # snapshot before pstats runs so the report's own allocations don't top the list
+            snapshot = tracemalloc.take_snapshot().filter_traces([tracemalloc.Filter(False, cProfile.__file__), tracemalloc.Filter(False, tracemalloc.__file__)])
+            tracemalloc.stop()
+            _capture_lock.release()
+            out = io.StringIO()
+            pstats.Stats(self.cprofile, stream=out).sort_stats('cumulative').print_stats(top)
+            self.cprofile = None
+            capture = {'cprofile': out.getvalue(), 'tracemalloc': [str(s) for s in snapshot.statistics('lineno')[:top]]}
+        for sp in self.spans.values(): metrics.observe(sp['name'], sp['seconds'])
+        if total is not None: metrics.observe('total', total)
+        return capture
@@ -1,48 +1,54 @@
 from flask import Flask, request, jsonify, Response
 from flask_cors import CORS
-import sqlite3
-import pandas as pd
-from backend_text_analysis import TextAnalyzer
+import sqlite3, json
+from backend_text_analysis import get_analyzer
+from backend_search import ensure_fts, fts_search
+from backend_db import pool_for
 
 app = Flask(__name__)
 CORS(app)
 DB_PATH = 'text_storage.db'
 
 def init_db():
-    conn = sqlite3.connect(DB_PATH)
-    # MILESTONE 4: Optimized Indexing
-    conn.execute('CREATE TABLE IF NOT EXISTS processed_chunks (id INTEGER PRIMARY KEY, chunk_text TEXT, score INTEGER, rules TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
-    conn.execute('CREATE INDEX IF NOT EXISTS idx_text ON processed_chunks(chunk_text)')
-    conn.execute('CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT, email TEXT UNIQUE, password TEXT)')
-    conn.commit()
-    conn.close()
+    with pool_for(DB_PATH).connection(write=True) as conn:
+        # MILESTONE 4: Optimized Indexing
+        conn.execute('CREATE TABLE IF NOT EXISTS processed_chunks (id INTEGER PRIMARY KEY, chunk_text TEXT, score INTEGER, rules TEXT, timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)')
+        conn.execute('DROP INDEX IF EXISTS idx_text')
+        ensure_fts(conn, 'processed_chunks', 'chunk_text')
+        conn.execute('CREATE TABLE IF NOT EXISTS users (id INTEGER PRIMARY KEY, name TEXT, email TEXT UNIQUE, password TEXT)')
 
 init_db()
 
 @app.route('/api/analyze', methods=['POST'])
 def analyze():
     data = request.json
-    analyzer = TextAnalyzer()
-    nlp_results, chunks, stats = analyzer.run_pipeline(data.get('text', ''), data.get('operations', []))
-    
-    # MILESTONE 3: Database Storage
-    conn = sqlite3.connect(DB_PATH)
-    for c in chunks:
-        conn.execute("INSERT INTO processed_chunks (chunk_text, score, rules) VALUES (?, ?, ?)", 
-                     (c['text'], c['score'], c['matched_rules']))
-    conn.commit()
-    conn.close()
+    analyzer = get_analyzer()
+    nlp_results, rows, stats, scores = analyzer.run_pipeline(data.get('text', ''), data.get('operations', []))
+    if rows is None: return jsonify({"results": nlp_results, "stats": stats})
+
+    # MILESTONE 3: Database Storage: one chunk per record, with the rule names its cells match
+    def chunk(row, score):
+        cells = {k: (None if isinstance(v, float) and v != v else v) for k, v in row.items()}
+        text = json.dumps(cells, ensure_ascii=False, separators=(',', ':'), default=str)
+        return text, int(score), ', '.join(analyzer.engine.matched(' '.join(str(v) for v in cells.values() if v is not None)))
+    with pool_for(DB_PATH).connection(write=True) as conn:
+        conn.executemany("INSERT INTO processed_chunks (chunk_text, score, rules) VALUES (?, ?, ?)", (chunk(r, s) for r, s in zip(rows, scores)))
 
     return jsonify({"results": nlp_results, "stats": stats})
 
 @app.route('/api/search', methods=['GET'])
 def search():
     # MILESTONE 3: Search Function
-    q = request.args.get('q', '')
-    conn = sqlite3.connect(DB_PATH)
-    df = pd.read_sql(f"SELECT * FROM processed_chunks WHERE chunk_text LIKE '%{q}%' LIMIT 10", conn)
-    conn.close()
-    return jsonify(df.to_dict('records'))
+    args = request.args
+    try:
+        with pool_for(DB_PATH).connection() as conn:
+            rows, next_cursor = fts_search(conn, 'processed_chunks', args.get('q', ''), args.get('mode', 'prefix'), args.get('sort', 'recent'),
+                                           args.get('cursor'), min(args.get('limit', 10, type=int), 100))
+    except (sqlite3.OperationalError, ValueError, IndexError):
+        return jsonify({"message": "Invalid search query"}), 400
+    resp = jsonify(rows)
+    if next_cursor: resp.headers['X-Next-Cursor'] = next_cursor
+    return resp
 
 if __name__ == '__main__':
     app.run(debug=True, port=5001)
\ No newline at end of file
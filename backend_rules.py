@@ -0,0 +1,104 @@
+import hashlib
+import json
+import os
+import re
+import threading
+import numpy as np
+import pandas as pd
+
+RULES_PATH = os.environ.get('RULES_PATH', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rules.json'))
+_engines = {}
+_compiled = {}
+_lock = threading.Lock()
+
+def _term_regex(term):
+    # 'total*' matches total/totals/totalled, a bare word only itself; the left edge is always a word boundary, so 'subtotal' never matches
+    if term.endswith('*'): return re.escape(term[:-1].lower()) + r'\w*'
+    return re.escape(term.lower()) + r'\b'
+
+class RuleEngine:
+    """Sentiment and pattern rules compiled once into a single word-bounded regex that scans a whole column in one pass.
+
+    rules is a list of (group, name, weight): one entry per sentiment term (weight +1/-1) and one per pattern (weight 0).
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.version = hashlib.sha1(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+        self.rules, exact, prefix = [], {}, []
+        for group, weight in (('positive', 1), ('negative', -1)):
+            for term in spec.get('sentiment', {}).get(group, []):
+                self._add(exact, prefix, term, (group, term, weight))
+        for name, terms in spec.get('patterns', {}).items():
+            for term in terms: self._add(exact, prefix, term, ('pattern', name, 0))
+        self.exact, self.prefix = exact, prefix
+        self.weights = np.array([w for _, _, w in self.rules], dtype=np.int64)
+        # longest first so a match always runs to the end of the word; the matched word is then resolved against every rule it satisfies
+        alts = sorted({_term_regex(t) for t in list(exact) + [p + '*' for p, _ in prefix]}, key=len, reverse=True)
+        self.regex = re.compile(r'\b(?:' + '|'.join(alts) + ')') if alts else None
+        self.resolved = {}
+
+    def _add(self, exact, prefix, term, rule):
+        if rule not in self.rules: self.rules.append(rule)
+        rid = self.rules.index(rule)
+        if term.endswith('*'): prefix.append((term[:-1].lower(), rid))
+        else: exact.setdefault(term.lower(), set()).add(rid)
+
+    def __reduce__(self):
+        # process-pool workers rebuild from the spec and keep one compiled engine per rule version
+        return _from_spec, (self.spec,)
+
+    def _resolve(self, word):
+        ids = self.resolved.get(word)
+        if ids is None:
+            ids = set(self.exact.get(word, ())) | {rid for p, rid in self.prefix if word.startswith(p)}
+            self.resolved[word] = ids = list(ids)
+        return ids
+
+    def scan(self, values):
+        """Returns (scores, hits): the per-row sentiment score and, aligned with self.rules, how many rows each rule matched."""
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype):
+            # already dictionary-encoded: scan the categories and reuse the codes, with missing values as 'nan' like astype(str)
+            codes, uniques = np.asarray(values.cat.codes, dtype=np.intp), values.cat.categories.astype(str).to_numpy(dtype=object)
+            if (codes < 0).any(): codes, uniques = np.where(codes < 0, len(uniques), codes), np.append(uniques, 'nan')
+        else: codes, uniques = pd.factorize(pd.Series(values, dtype=object).astype(str).to_numpy())
+        matched = np.zeros((len(uniques), len(self.rules)), dtype=bool)
+        if self.regex is not None:
+            # each distinct cell is scanned once; a rule counts once per cell however often it occurs, as before
+            for i, u in enumerate(uniques):
+                for word in self.regex.findall(u.lower()): matched[i, self._resolve(word)] = True
+        scores = (matched @ self.weights)[codes]
+        hits = np.bincount(codes, minlength=len(uniques)) @ matched if len(uniques) else np.zeros(len(self.rules), dtype=np.int64)
+        return scores, hits.astype(np.int64)
+
+    def matched(self, text):
+        """Names of the rules one text matches, in rule order."""
+        ids = set()
+        if self.regex is not None:
+            for word in self.regex.findall(str(text).lower()): ids.update(self._resolve(word))
+        return [self.rules[i][1] for i in sorted(ids)]
+
+    def patterns(self, hits):
+        """Row frequency per pattern name, for the patterns that matched at least once."""
+        out = {}
+        for (group, name, _), n in zip(self.rules, hits):
+            if group == 'pattern' and n: out[name] = out.get(name, 0) + int(n)
+        return out
+
+def _from_spec(spec):
+    key = json.dumps(spec, sort_keys=True)
+    with _lock:
+        if key not in _compiled: _compiled[key] = RuleEngine(spec)
+        return _compiled[key]
+
+def load_rules(path=RULES_PATH):
+    with open(path, encoding='utf-8') as f: return json.load(f)
+
+def get_engine(path=RULES_PATH):
+    """Process-wide engine for a rules file; recompiled only when the file changes on disk."""
+    mtime = os.path.getmtime(path)
+    with _lock: cached = _engines.get(path)
+    if cached is not None and cached[0] == mtime: return cached[1]
+    engine = _from_spec(load_rules(path))
+    with _lock: _engines[path] = (mtime, engine)
+    return engine
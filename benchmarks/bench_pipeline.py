@@ -0,0 +1,90 @@
+"""Micro-benchmarks for TextAnalyzer on synthetic datasets scaled from the bundled CSVs.
+
+    python benchmarks/bench_pipeline.py [--scales 1,100] [--datasets survey,country,employment]
+                                        [--repeat 3] [--out bench_pipeline.json]
+                                        [--baseline old.json] [--tolerance 0.2]
+
+Scaled inputs are generated once into benchmarks/.data. 1000x is supported but opt-in: the employment
+set alone is ~4 GB at that scale. Translation goes through an offline echo backend, so no network is used.
+Exits non-zero when --baseline is given and any median time regressed by more than --tolerance.
+"""
+import argparse
+import statistics
+import sys
+
+from common import SCALES, DATASETS, dataset_text, install_offline_translator, legacy_score_text, measure, write_results, compare
+from backend_text_analysis import TextAnalyzer
+from backend_metrics import Profiler
+
+OPERATIONS = ['Summarization', 'Sentiment Analysis', 'Keyword Extraction', 'Translation']
+PER_ROW_LIMIT = 10000
+
+
+def op_spans(analyzer, text, repeat):
+    """Per-operation time from the profiler's op:<name> spans, so each op is timed without the parse/score work every run shares."""
+    samples = {op: [] for op in OPERATIONS}
+    for _ in range(repeat):
+        # never finished, so the runs don't feed the process-wide histograms
+        profiler = Profiler()
+        analyzer.run_pipeline(text, OPERATIONS, profiler=profiler)
+        spans = {s['name']: s['seconds'] for s in profiler.report()}
+        for op in OPERATIONS: samples[op].append(spans.get(f'op:{op}', 0.0))
+    return {f'op:{op}': {'min': min(t), 'median': statistics.median(t), 'mean': statistics.fmean(t), 'runs': repeat} for op, t in samples.items()}
+
+
+def bench_dataset(name, scale, repeat):
+    analyzer = TextAnalyzer()
+    text = dataset_text(name, scale)
+    df, parse = measure(lambda: analyzer._get_df(text), repeat)
+    rows = len(df)
+    candidates = analyzer._candidates(df.columns)
+    column = df[max(candidates, key=lambda c: df[c].astype(str).str.len().mean())]
+    sample = column.head(PER_ROW_LIMIT).tolist()
+
+    out = {'get_df': dict(parse, rows=rows)}
+    _, out['scoring'] = measure(lambda: analyzer._score_column(column), repeat)
+    _, out['legacy_per_row'] = measure(lambda: [legacy_score_text(t) for t in sample], repeat)
+    _, out['pattern_detection'] = measure(lambda: analyzer.engine.patterns(analyzer.engine.scan(column)[1]), repeat)
+    out['scoring']['rows'] = out['pattern_detection']['rows'] = rows
+    out['legacy_per_row']['rows'] = len(sample)
+    # warm-up: the first langdetect call loads its language profiles, which would land on whichever op runs first
+    analyzer.run_pipeline(text, OPERATIONS)
+    # the op spans only render already-aggregated results, so they carry no row count and no throughput
+    out.update(op_spans(analyzer, text, repeat))
+    for mode, kwargs in (('in_memory', {}), ('stream', {'stream': True})):
+        # one extra profiled run keeps the per-stage split next to the end-to-end time
+        profiler = Profiler().start()
+        analyzer.run_pipeline(text, OPERATIONS, profiler=profiler, **kwargs)
+        _, out[f'pipeline:{mode}'] = measure(lambda: analyzer.run_pipeline(text, OPERATIONS, **kwargs), repeat)
+        out[f'pipeline:{mode}'].update(rows=rows, stages={s['name']: s['seconds'] for s in profiler.report()})
+    for result in out.values(): result['rows_per_sec'] = result['rows'] / result['median'] if 'rows' in result and result['median'] else None
+    return {f'{name}/x{scale}/{bench}': result for bench, result in out.items()}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scales', default='1,100', help=f"comma-separated subset of {','.join(map(str, SCALES))}")
+    parser.add_argument('--datasets', default=','.join(DATASETS))
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--out', default='bench_pipeline.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    install_offline_translator()
+    results = {}
+    for name in args.datasets.split(','):
+        for scale in map(int, args.scales.split(',')):
+            part = bench_dataset(name, scale, args.repeat)
+            for key, r in part.items():
+                rate = f"  {r['rows_per_sec']:14,.0f} rows/sec" if r['rows_per_sec'] else ''
+                print(f"{key:55s} {r['median']:10.4f}s{rate}")
+            results.update(part)
+    write_results(args.out, results)
+    print(f"wrote {args.out}")
+    if args.baseline and compare(results, args.baseline, 'median', args.tolerance): return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
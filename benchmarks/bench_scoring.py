@@ -0,0 +1,44 @@
+"""Rows/sec of the original per-row ThreadPoolExecutor scorer (frozen in common.legacy_score_text) vs TextAnalyzer._score_column.
+
+    python benchmarks/bench_scoring.py [repeat]
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from common import ROOT, legacy_score_text
+from backend_text_analysis import TextAnalyzer
+
+CSV_PATH = os.path.join(ROOT, 'business-operations-survey-2022-business-finance.csv')
+
+
+def timed(fn):
+    start = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - start
+
+
+def main(repeat=100):
+    analyzer = TextAnalyzer()
+    df = pd.read_csv(CSV_PATH, encoding_errors='replace')
+    column = pd.concat([df['description']] * repeat, ignore_index=True)
+
+    def threaded():
+        with ThreadPoolExecutor(max_workers=15) as ex:
+            return list(ex.map(legacy_score_text, column.tolist()))
+
+    old, old_t = timed(threaded)
+    new, new_t = timed(lambda: analyzer._score_column(column).tolist())
+    # the engine matches whole words (and rules.json has grown), so some rows legitimately score differently
+    differ = sum(a != b for a, b in zip(old, new))
+
+    print(f"rows: {len(column)} (x{repeat}), scored differently: {differ}")
+    print(f"thread pool : {old_t:8.3f}s  {len(column) / old_t:12,.0f} rows/sec")
+    print(f"vectorized  : {new_t:8.3f}s  {len(column) / new_t:12,.0f} rows/sec  ({old_t / new_t:.1f}x)")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
@@ -0,0 +1,82 @@
+"""Cold-start budget: import time of the analysis modules and the app, and the latency of the first /api/analyze requests.
+
+    python benchmarks/bench_startup.py [--repeat 3] [--dataset survey]
+                                       [--import-budget 2.0] [--first-request-budget 1.0]
+                                       [--out bench_startup.json] [--baseline old.json] [--tolerance 0.2]
+
+Every run is a fresh interpreter in a temporary directory (translation stubbed out, no process pool), once with the
+startup warm-up and once with WARM_UP=0, so the report shows what the warm-up moves from the first request to boot.
+Exits non-zero when the warm start is over either budget, or when --baseline is given and any median regressed by
+more than --tolerance.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from common import ROOT, dataset_path, write_results, compare
+
+CHILD = r'''
+import json, os, sys, time
+start = time.perf_counter()
+import backend_text_analysis
+analysis = time.perf_counter()
+import app
+booted = time.perf_counter()
+from common import install_offline_translator
+install_offline_translator()
+with open(sys.argv[1], encoding='utf-8') as f: text = f.read()
+header, rows = text.split('\n', 1)
+client = app.app.test_client()
+ops = ['Summarization', 'Sentiment Analysis', 'Keyword Extraction', 'Translation']
+latency = []
+# the second request drops a row so it misses the result cache like the first
+for body in (text, header + '\n' + rows.split('\n', 1)[1]):
+    t = time.perf_counter()
+    assert client.post('/api/analyze', json={'text': body, 'operations': ops}).status_code == 200
+    latency.append(time.perf_counter() - t)
+print(json.dumps({'import_analysis': analysis - start, 'import_app': booted - start, 'first_request': latency[0], 'second_request': latency[1]}))
+'''
+
+
+def run_child(path, warm):
+    env = dict(os.environ, WARM_UP='1' if warm else '0', PARALLEL_WORKERS='1',
+               PYTHONPATH=os.pathsep.join([ROOT, os.path.join(ROOT, 'benchmarks')]))
+    out = subprocess.run([sys.executable, '-c', CHILD, path], cwd=tempfile.mkdtemp(prefix='startup-'), env=env,
+                         capture_output=True, text=True, check=True)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--dataset', default='survey')
+    parser.add_argument('--import-budget', type=float, default=2.0, help='seconds for importing app, warm-up included')
+    parser.add_argument('--first-request-budget', type=float, default=1.0, help='seconds for the first /api/analyze')
+    parser.add_argument('--out', default='bench_startup.json')
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    path = dataset_path(args.dataset, 1)
+    results = {}
+    for mode, warm in (('warm', True), ('cold', False)):
+        runs = [run_child(path, warm) for _ in range(args.repeat)]
+        for key in runs[0]:
+            times = [r[key] for r in runs]
+            results[f'{mode}/{key}'] = {'min': min(times), 'median': statistics.median(times), 'runs': args.repeat}
+            print(f"{mode}/{key:20s} {results[f'{mode}/{key}']['median']:8.3f}s")
+    over = [(k, budget) for k, budget in (('warm/import_app', args.import_budget), ('warm/first_request', args.first_request_budget))
+            if results[k]['median'] > budget]
+    for k, budget in over: print(f"{k} over budget: {results[k]['median']:.3f}s > {budget:.3f}s")
+    write_results(args.out, results)
+    print(f"wrote {args.out}")
+    if over or (args.baseline and compare(results, args.baseline, 'median', args.tolerance)): return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
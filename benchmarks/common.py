@@ -0,0 +1,121 @@
+"""Shared helpers for the benchmark scripts: scaled datasets, an offline translator, timing and baseline comparison."""
+import io
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import zipfile
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DATA_DIR = os.path.join(ROOT, 'benchmarks', '.data')
+SEED = 2025
+SCALES = (1, 100, 1000)
+# name -> (file, member inside a zip or None)
+DATASETS = {
+    'survey': ('business-operations-survey-2022-business-finance.csv', None),
+    'country': ('country.csv', None),
+    'employment': ('business-employment-data-september-2025-quarter-updated-19-december-2025.zip',
+                   'machine-readable-business-employment-data-sep-2025-quarter.csv'),
+}
+
+
+def base_frame(name):
+    path, member = DATASETS[name]
+    path = os.path.join(ROOT, path)
+    if member is None: return pd.read_csv(path, dtype=str, keep_default_na=False, encoding_errors='replace')
+    with zipfile.ZipFile(path) as zf, zf.open(member) as f:
+        return pd.read_csv(io.TextIOWrapper(f, encoding='utf-8', errors='replace'), dtype=str, keep_default_na=False)
+
+
+def dataset_path(name, scale):
+    """CSV with `scale` seeded shuffles of the base rows, written once under benchmarks/.data and reused across runs."""
+    path = os.path.join(DATA_DIR, f'{name}-x{scale}.csv')
+    if os.path.exists(path): return path
+    os.makedirs(DATA_DIR, exist_ok=True)
+    df = base_frame(name)
+    tmp = path + '.tmp'
+    # one copy at a time, so even the 1000x files never need more than the base frame in memory
+    with open(tmp, 'w', encoding='utf-8', newline='') as f:
+        df.to_csv(f, index=False)
+        for i in range(1, scale): df.sample(frac=1, random_state=SEED + i).to_csv(f, index=False, header=False)
+    os.replace(tmp, path)
+    return path
+
+
+def dataset_text(name, scale):
+    with open(dataset_path(name, scale), encoding='utf-8') as f: return f.read()
+
+
+# Frozen copy of the per-row substring scorer the rule engine replaced, kept only as the benchmarks' baseline. It matches
+# substrings ('subtotal' counts as 'total'), so its scores differ from the word-bounded engine on some rows by design.
+LEGACY_SENTIMENT = {
+    'positive': ['total', 'graduate', 'agriculture', 'forestry', 'fishing', 'support', 'active', 'success', 'helpful', 'profit'],
+    'negative': ['debt', 'overdraft', 'outstanding', 'issue', 'delayed', 'fail', 'error', 'poor', 'unpaid', 'loss'],
+}
+
+
+def legacy_score_text(t):
+    text_lower = str(t).lower()
+    return sum(w in text_lower for w in LEGACY_SENTIMENT['positive']) - sum(w in text_lower for w in LEGACY_SENTIMENT['negative'])
+
+
+class EchoBackend:
+    """Offline stand-in for GoogleBackend: returns the text unchanged so non-English inputs still exercise the translation path."""
+
+    def translate(self, text, source):
+        return text
+
+
+def install_offline_translator():
+    import backend_translation
+    backend_translation._default = backend_translation.TranslationLayer(backend=EchoBackend(), path=':memory:')
+    return backend_translation._default
+
+
+def measure(fn, repeat):
+    """Runs fn `repeat` times; returns (last result, timing summary in seconds)."""
+    times, out = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        out = fn()
+        times.append(time.perf_counter() - start)
+    return out, {'min': min(times), 'median': statistics.median(times), 'mean': statistics.fmean(times), 'runs': repeat}
+
+
+def percentiles(latencies):
+    lat = sorted(latencies)
+    if not lat: return {}
+    pct = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))]
+    return {'p50': pct(0.50), 'p95': pct(0.95), 'p99': pct(0.99), 'max': lat[-1]}
+
+
+def meta():
+    try: commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError: commit = None
+    return {'commit': commit, 'python': platform.python_version(), 'pandas': pd.__version__, 'platform': platform.platform(),
+            'cpus': os.cpu_count(), 'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S')}
+
+
+def write_results(path, results):
+    with open(path, 'w', encoding='utf-8') as f: json.dump({'meta': meta(), 'results': results}, f, indent=2, sort_keys=True)
+
+
+def compare(results, baseline_path, metric, tolerance, higher_is_better=False):
+    """Prints each shared key's change against the baseline; returns the keys that regressed by more than `tolerance`."""
+    with open(baseline_path, encoding='utf-8') as f: baseline = json.load(f)['results']
+    regressions = []
+    for key in sorted(set(results) & set(baseline)):
+        new, old = results[key].get(metric), baseline[key].get(metric)
+        if not new or not old: continue
+        change = (old / new - 1) if higher_is_better else (new / old - 1)
+        flag = '  REGRESSION' if change > tolerance else ''
+        print(f"{key:55s} {old:12.6g} -> {new:12.6g}  {change:+7.1%}{flag}")
+        if flag: regressions.append(key)
+    return regressions
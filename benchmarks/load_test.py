@@ -0,0 +1,112 @@
+"""HTTP load generator for /api/analyze, /api/search, /api/history and /api/inbox.
+
+    python benchmarks/load_test.py [--url http://127.0.0.1:5001] [--requests 200] [--concurrency 8]
+                                   [--dataset survey] [--scale 1] [--analyze-cache miss|hit]
+                                   [--out load_test.json] [--baseline old.json] [--tolerance 0.2]
+
+Without --url the Flask app is started in-process on a free port, inside a temporary directory so its
+SQLite files don't touch the working tree, with translation stubbed out. Reports throughput and tail
+latency per endpoint; exits non-zero when --baseline is given and any p95 regressed by more than --tolerance.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from common import dataset_text, install_offline_translator, percentiles, write_results, compare
+
+SEARCH_TERMS = ['debt', 'bank overdraft', 'total', 'retail', 'agriculture', 'employees']
+
+
+def start_server():
+    os.chdir(tempfile.mkdtemp(prefix='loadtest-'))
+    install_offline_translator()
+    # per-request access logs would swamp the report
+    logging.getLogger('werkzeug').setLevel(logging.WARNING)
+    from werkzeug.serving import make_server
+    import app as flask_app
+    server = make_server('127.0.0.1', 0, flask_app.app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return f'http://127.0.0.1:{server.server_port}'
+
+
+def call(url, body=None):
+    data = json.dumps(body).encode() if body is not None else None
+    req = urllib.request.Request(url, data=data, headers={'Content-Type': 'application/json'} if data else {})
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=300) as resp:
+            resp.read()
+            ok = resp.status < 400
+    except (urllib.error.URLError, OSError): ok = False
+    return time.perf_counter() - start, ok
+
+
+def rotated(text, i):
+    # same rows in a different order: identical analysis, but a distinct result-cache key
+    header, rows = text.split('\n', 1)
+    rows = rows.rstrip('\n').split('\n')
+    k = i % len(rows)
+    return header + '\n' + '\n'.join(rows[k:] + rows[:k])
+
+
+def run(name, requests, concurrency):
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as ex: outcomes = list(ex.map(lambda r: call(*r), requests))
+    wall = time.perf_counter() - start
+    latencies = [t for t, ok in outcomes if ok]
+    out = {'requests': len(outcomes), 'errors': sum(1 for _, ok in outcomes if not ok), 'seconds': wall,
+           'throughput': len(latencies) / wall if wall else None, 'concurrency': concurrency}
+    out.update({k: v * 1000 for k, v in percentiles(latencies).items()})
+    print(f"{name:14s} {out['throughput'] or 0:9.1f} req/s  p50 {out.get('p50', 0):8.1f} ms  p95 {out.get('p95', 0):8.1f} ms  "
+          f"p99 {out.get('p99', 0):8.1f} ms  errors {out['errors']}")
+    return out
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--dataset', default='survey')
+    parser.add_argument('--scale', type=int, default=1)
+    parser.add_argument('--analyze-cache', choices=('miss', 'hit'), default='miss')
+    parser.add_argument('--out', default=os.path.abspath('load_test.json'))
+    parser.add_argument('--baseline')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args(argv)
+    if args.baseline: args.baseline = os.path.abspath(args.baseline)
+
+    text = dataset_text(args.dataset, args.scale)
+    base = args.url.rstrip('/') if args.url else start_server()
+    ops = ['Summarization', 'Sentiment Analysis', 'Keyword Extraction']
+    # a few analyses first, so history, inbox and search have rows to return
+    for i in range(3): call(f'{base}/api/analyze', {'text': rotated(text, i), 'operations': ops, 'filename': 'warmup.csv'})
+
+    n = args.requests
+    # analyze is much heavier than the reads, so it gets a tenth of the request count
+    analyze_n = max(n // 10, 1)
+    workloads = {
+        '/api/analyze': [(f'{base}/api/analyze', {'text': text if args.analyze_cache == 'hit' else rotated(text, 3 + i), 'operations': ops,
+                                                  'filename': 'loadtest.csv'}) for i in range(analyze_n)],
+        '/api/search': [(f'{base}/api/search?' + urllib.parse.urlencode({'q': SEARCH_TERMS[i % len(SEARCH_TERMS)]}),) for i in range(n)],
+        '/api/history': [(f'{base}/api/history',) for _ in range(n)],
+        '/api/inbox': [(f'{base}/api/inbox',) for _ in range(n)],
+    }
+    results = {f'{args.dataset}/x{args.scale}{name}': run(name, reqs, args.concurrency) for name, reqs in workloads.items()}
+    write_results(args.out, results)
+    print(f"wrote {args.out}")
+    if args.baseline and compare(results, args.baseline, 'p95', args.tolerance): return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())